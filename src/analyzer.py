@@ -98,6 +98,7 @@ class StockAnalysis:
     # News Sentiment
     news_sentiment: Optional[float] = None
     news_summary: Optional[str] = None
+    news_articles: List[Dict[str, Any]] = field(default_factory=list)  # Scored headlines, persisted to the news table
     
     # Options data
     implied_volatility: Optional[float] = None
@@ -377,6 +378,7 @@ class StockAnalyzer:
         if news_data:
             analysis.news_sentiment = news_data.get("average_sentiment", 0.0)
             analysis.news_summary = news_data.get("sentiment_label", "Neutral")
+            analysis.news_articles = news_data.get("articles", [])
         else:
             analysis.news_sentiment = 0.0
             analysis.news_summary = "Neutral"
@@ -490,6 +492,7 @@ class StockAnalyzer:
                 # Align keys from NewsSentimentSource with StockAnalysis properties
                 main_analysis.news_sentiment = news_data.get("average_sentiment", 0.0)
                 main_analysis.news_summary = news_data.get("sentiment_label", "Neutral")
+                main_analysis.news_articles = news_data.get("articles", [])
                 
             if not isinstance(macrotrends_data, Exception) and macrotrends_data:
                 main_analysis.revenue = macrotrends_data.get('revenue', main_analysis.revenue)
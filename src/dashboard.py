@@ -21,7 +21,7 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-from src.analyzer import StockAnalyzer
+from src.utils import get_shared_analyzer
 from src.database import Database
 from src.visualization_tv import TVChartGenerator
 from src.auth import AuthManager
@@ -40,9 +40,8 @@ def init_database():
         AuthManager.seed_admin(session)
     return db
 
-@st.cache_resource
 def init_analyzer():
-    return StockAnalyzer()
+    return get_shared_analyzer()
 
 @st.cache_resource
 def init_chart_generator():
@@ -125,8 +124,7 @@ def main():
         
     elif page == "🛡️ Admin Dashboard":
         from src.views.admin_dashboard import show_admin_dashboard
-        with db.get_session() as session:
-            show_admin_dashboard(db, session)
+        show_admin_dashboard(db)
             
     elif page == "🏁 Multi-Style":
         if st.session_state.get('user_tier') != 'admin':
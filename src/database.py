@@ -176,6 +176,87 @@ class Database:
                         if "already exists" not in str(e).lower():
                             print(f"❌ Error adding column {col} to {table}: {e}")
                     
+        # Indexes added after the initial schema; create_all() skips tables that already exist
+        new_indexes = [
+            ("uq_news_stock_url", "news", "(stock_id, url)", True),
+            ("ix_useractivity_ticker_ts", "user_activity", "(ticker, timestamp)", False),
+        ]
+        for name, table, cols, unique in new_indexes:
+            try:
+                existing = {ix['name'] for ix in inspector.get_indexes(table)}
+                existing |= {uc['name'] for uc in inspector.get_unique_constraints(table)}
+                if name in existing:
+                    continue
+                unique_sql = "UNIQUE " if unique else ""
+                with self.engine.begin() as ddl_conn:
+                    if unique:
+                        # Keep the oldest row of each duplicate group so the unique index can be built
+                        # (rows with a NULL key column never conflict and are left alone)
+                        col_names = [c.strip() for c in cols.strip("()").split(",")]
+                        not_null = " AND ".join(f'"{c}" IS NOT NULL' for c in col_names)
+                        group_by = ", ".join(f'"{c}"' for c in col_names)
+                        removed = ddl_conn.execute(text(
+                            f'DELETE FROM "{table}" WHERE {not_null} AND id NOT IN '
+                            f'(SELECT MIN(id) FROM "{table}" WHERE {not_null} GROUP BY {group_by})'
+                        )).rowcount
+                        if removed:
+                            print(f"✅ Migrated: Removed {removed} duplicate rows from {table} before adding {name}")
+                    ddl_conn.execute(text(f'CREATE {unique_sql}INDEX IF NOT EXISTS "{name}" ON "{table}" {cols}'))
+            except Exception as e:
+                print(f"❌ Error creating index {name} on {table}: {e}")
+                if unique:
+                    # Upserts rely on this index as their ON CONFLICT target; running without it would fail every write
+                    raise
+                    
+        # Foreign keys that cascade deletes in the database, for deletes issued outside the ORM
+        # (relationships still delete their children). SQLite cannot alter constraints in
+        # place, so only Postgres tables are rewritten
+        cascade_fks = [
+            ("analyses", "stock_id", "stocks"),
+            ("news", "stock_id", "stocks"),
+            ("watchlist_items", "watchlist_id", "watchlists"),
+            ("watchlist_items", "stock_id", "stocks"),
+            ("alerts", "stock_id", "stocks"),
+            ("alert_history", "alert_id", "alerts"),
+        ]
+        if self.engine.dialect.name == "postgresql":
+            for table, col, ref_table in cascade_fks:
+                try:
+                    for fk in inspector.get_foreign_keys(table):
+                        ondelete = (fk.get('options') or {}).get('ondelete') or ''
+                        if fk['constrained_columns'] != [col] or ondelete.upper() == 'CASCADE':
+                            continue
+                        name = fk['name']
+                        with self.engine.begin() as ddl_conn:
+                            ddl_conn.execute(text(f'ALTER TABLE "{table}" DROP CONSTRAINT "{name}"'))
+                            ddl_conn.execute(text(
+                                f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" FOREIGN KEY ("{col}") '
+                                f'REFERENCES "{ref_table}" (id) ON DELETE CASCADE'
+                            ))
+                        print(f"✅ Migrated: {table}.{col} now cascades on delete")
+                except Exception as e:
+                    print(f"❌ Error migrating foreign key {table}.{col}: {e}")
+                    
+        # Large JSON text columns compress well; store them with LZ4 TOAST compression (Postgres 14+).
+        # news_summary only holds a one-word sentiment label, far below the TOAST threshold
+        compressed_cols = [
+            ("analyses", "earnings_history_json"),
+        ]
+        if self.engine.dialect.name == "postgresql":
+            try:
+                with self.engine.begin() as ddl_conn:
+                    if ddl_conn.dialect.server_version_info >= (14,):
+                        for table, col in compressed_cols:
+                            current = ddl_conn.execute(text(
+                                "SELECT attcompression FROM pg_attribute "
+                                "WHERE attrelid = CAST(:table AS regclass) AND attname = :col"
+                            ), {"table": table, "col": col}).scalar()
+                            if current != 'l':
+                                ddl_conn.execute(text(f'ALTER TABLE "{table}" ALTER COLUMN "{col}" SET COMPRESSION lz4'))
+                                print(f"✅ Migrated: {table}.{col} now uses lz4 compression")
+            except Exception as e:
+                print(f"❌ Error setting column compression: {e}")
+                    
         print(f"Database initialized at: {self.db_url.split('@')[-1] if '@' in self.db_url else self.db_url}")
         
     @contextmanager
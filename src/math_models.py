@@ -36,35 +36,37 @@ class MonteCarloEngine:
         dt = 1 # 1 day
         
         # Generate random shocks: Z ~ N(0, 1) matrix of size (days_out, num_simulations)
-        # Using numpy vectorized operations for speed
-        np.random.seed(42) # For reproducibility in displays
-        Z = np.random.normal(loc=0.0, scale=1.0, size=(days_out, num_simulations))
+        # A seeded PCG64 generator keeps displays reproducible without touching global state;
+        # float32 shocks halve the memory traffic of the draw and the exp below
+        rng = np.random.default_rng(42)
+        Z = rng.standard_normal((days_out, num_simulations), dtype=np.float32)
         
         # Calculate daily drift (adjusted for volatility drag)
         daily_drift = mu - (0.5 * sigma**2)
         
-        # Calculate daily step multiplier for each path
-        daily_steps = np.exp(daily_drift * dt + sigma * np.sqrt(dt) * Z)
+        # Calculate daily step multiplier for each path (scalars cast so the math stays float32)
+        daily_steps = np.exp(np.float32(daily_drift * dt) + np.float32(sigma * np.sqrt(dt)) * Z)
         
         # Initialize paths matrix
         # Row 0 is the current price
-        paths = np.zeros((days_out + 1, num_simulations))
+        paths = np.empty((days_out + 1, num_simulations))
         paths[0] = current_price
         
-        # Compute cumulative product across the columns to trace the price paths
-        for t in range(1, days_out + 1):
-            paths[t] = paths[t-1] * daily_steps[t-1]
+        # Trace the price paths with one cumulative product down the rows, accumulated in float64
+        np.cumprod(daily_steps, axis=0, dtype=np.float64, out=paths[1:])
+        paths[1:] *= current_price
             
         # Extract the final prices (the last row of the paths matrix)
         final_prices = paths[-1]
         
-        # Calculate important percentiles (5th, 25th, 50th, 75th, 95th)
+        # Calculate important percentiles (5th, 25th, 50th, 75th, 95th) in a single pass
+        p5, p25, p50, p75, p95 = np.percentile(final_prices, [5, 25, 50, 75, 95])
         percentiles = {
-            "p5": float(np.percentile(final_prices, 5)),
-            "p25": float(np.percentile(final_prices, 25)),
-            "p50": float(np.percentile(final_prices, 50)),
-            "p75": float(np.percentile(final_prices, 75)),
-            "p95": float(np.percentile(final_prices, 95))
+            "p5": float(p5),
+            "p25": float(p25),
+            "p50": float(p50),
+            "p75": float(p75),
+            "p95": float(p95)
         }
         
         # Get probability of being above current price
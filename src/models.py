@@ -1,9 +1,9 @@
 """Database models for stock analysis persistence"""
 
 from datetime import datetime
-from typing import Optional
-from sqlalchemy import Column, Integer, BigInteger, String, Float, DateTime, ForeignKey, Text, Index
-from sqlalchemy.orm import declarative_base, relationship
+from typing import Optional, Iterable, Dict, Any
+from sqlalchemy import Column, Integer, BigInteger, String, Float, DateTime, ForeignKey, Text, Index, UniqueConstraint
+from sqlalchemy.orm import declarative_base, relationship, Session
 
 Base = declarative_base()
 
@@ -37,6 +37,8 @@ class Stock(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
+    # The ORM deletes children itself. SQLite ignores the FKs' ON DELETE CASCADE
+    # (foreign_keys pragma is never enabled), so on SQLite this is the only cascade
     analyses = relationship("Analysis", back_populates="stock", cascade="all, delete-orphan")
     news_items = relationship("News", back_populates="stock", cascade="all, delete-orphan")
     
@@ -49,7 +51,7 @@ class Analysis(Base):
     __tablename__ = 'analyses'
     
     id = Column(Integer, primary_key=True)
-    stock_id = Column(Integer, ForeignKey('stocks.id'), nullable=False)
+    stock_id = Column(Integer, ForeignKey('stocks.id', ondelete='CASCADE'), nullable=False)
     timestamp = Column(DateTime, nullable=False, index=True)
     analysis_timestamp = Column(DateTime)  # Actual time of analysis
     trading_style = Column(String(50), default="Growth Investing") # e.g. "Growth Investing" or "Swing Trading"
@@ -133,7 +135,7 @@ class News(Base):
     __tablename__ = 'news'
     
     id = Column(Integer, primary_key=True)
-    stock_id = Column(Integer, ForeignKey('stocks.id'), nullable=False)
+    stock_id = Column(Integer, ForeignKey('stocks.id', ondelete='CASCADE'), nullable=False)
     headline = Column(Text, nullable=False)
     url = Column(Text)
     published_date = Column(DateTime, index=True)
@@ -144,6 +146,67 @@ class News(Base):
     # Relationships
     stock = relationship("Stock", back_populates="news_items")
     
+    # One row per article per stock so re-synced headlines are deduplicated by the DB
+    __table_args__ = (
+        UniqueConstraint('stock_id', 'url', name='uq_news_stock_url'),
+    )
+    
+    # Rows per multi-row INSERT statement
+    BULK_CHUNK_SIZE = 500
+    
+    @classmethod
+    def bulk_upsert(cls, session: Session, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert news rows in chunked multi-row statements, skipping (stock_id, url) duplicates.
+        
+        Uses INSERT ... ON CONFLICT DO NOTHING on PostgreSQL and INSERT OR IGNORE
+        semantics on SQLite. Other dialects fall back to filtering known URLs first.
+        
+        Args:
+            session: Database session (caller commits)
+            rows: Dicts of News column values; must include 'stock_id' and 'headline'
+            
+        Returns:
+            Number of rows actually inserted
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        
+        dialect = session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            dialect_insert = None
+        
+        inserted = 0
+        for start in range(0, len(rows), cls.BULK_CHUNK_SIZE):
+            chunk = rows[start:start + cls.BULK_CHUNK_SIZE]
+            if dialect_insert is not None:
+                stmt = dialect_insert(cls).values(chunk).on_conflict_do_nothing(
+                    index_elements=['stock_id', 'url']
+                )
+                result = session.execute(stmt)
+                inserted += max(result.rowcount or 0, 0)
+            else:
+                stock_ids = {r['stock_id'] for r in chunk}
+                existing = {
+                    tuple(r) for r in
+                    session.query(cls.stock_id, cls.url).filter(cls.stock_id.in_(stock_ids)).all()
+                }
+                fresh = []
+                for r in chunk:
+                    key = (r['stock_id'], r.get('url'))
+                    if key not in existing:
+                        existing.add(key)
+                        fresh.append(r)
+                if fresh:
+                    session.execute(cls.__table__.insert(), fresh)
+                    inserted += len(fresh)
+        return inserted
+    
     def __repr__(self):
         return f"<News(stock_id={self.stock_id}, headline='{self.headline[:50]}...', sentiment={self.sentiment_score})>"
 
@@ -171,8 +234,8 @@ class WatchlistItem(Base):
     __tablename__ = 'watchlist_items'
     
     id = Column(Integer, primary_key=True)
-    watchlist_id = Column(Integer, ForeignKey('watchlists.id'), nullable=False)
-    stock_id = Column(Integer, ForeignKey('stocks.id'), nullable=False)
+    watchlist_id = Column(Integer, ForeignKey('watchlists.id', ondelete='CASCADE'), nullable=False)
+    stock_id = Column(Integer, ForeignKey('stocks.id', ondelete='CASCADE'), nullable=False)
     added_at = Column(DateTime, default=datetime.utcnow)
     notes = Column(Text)
     
@@ -195,7 +258,7 @@ class Alert(Base):
     
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False, default=1)
-    stock_id = Column(Integer, ForeignKey('stocks.id'), nullable=False)
+    stock_id = Column(Integer, ForeignKey('stocks.id', ondelete='CASCADE'), nullable=False)
     alert_type = Column(String(50), nullable=False)  # price, rsi, macd, volume, earnings
     condition = Column(String(50), nullable=False)  # above, below, crosses_above, crosses_below
     threshold = Column(Float)  # threshold value
@@ -222,7 +285,7 @@ class AlertHistory(Base):
     __tablename__ = 'alert_history'
     
     id = Column(Integer, primary_key=True)
-    alert_id = Column(Integer, ForeignKey('alerts.id'), nullable=False)
+    alert_id = Column(Integer, ForeignKey('alerts.id', ondelete='CASCADE'), nullable=False)
     triggered_at = Column(DateTime, default=datetime.utcnow, index=True)
     value = Column(Float)  # actual value that triggered the alert
     message = Column(Text)
@@ -294,10 +357,11 @@ class UserActivity(Base):
     duration_seconds = Column(Float, nullable=True)       # approximate time spent (may be None)
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
 
-    # Composite index for efficient admin queries (by user, by feature, by time)
+    # Composite index for efficient admin queries (by user, by feature, by ticker, by time)
     __table_args__ = (
         Index('ix_useractivity_user_ts', 'user_id', 'timestamp'),
         Index('ix_useractivity_feature_ts', 'feature', 'timestamp'),
+        Index('ix_useractivity_ticker_ts', 'ticker', 'timestamp'),
     )
 
     def __repr__(self):
@@ -108,28 +108,20 @@ class OptionsProfitCalculator:
         current_cost = current_option_price * 100  # 1 Option Contract = 100 shares
         
         # Plot curve varying the underlying asset price from -20% to +30%
-        prices = []
-        profits = []
-        
         min_price = entry_price * 0.8
         max_price = max(target_price * 1.1, entry_price * 1.3)
-        step = (max_price - min_price) / 40.0
+        # 41 evenly spaced points; indexing the grid (rather than accumulating a step) keeps the upper bound
+        prices = [min_price + (max_price - min_price) * i / 40.0 for i in range(41)]
         
-        curr_p = min_price
-        while curr_p <= max_price:
-            # Theoretical price assuming we hold until 1 week before expiration 
-            # (so theta decay has happened, T = 7/365)
-            # OR we can just show P/L AT expiration
-            eval_T = 7.0 / 365.0
-            opt_price_at_target_date = cls.black_scholes(
+        # Theoretical price assuming we hold until 1 week before expiration 
+        # (so theta decay has happened, T = 7/365)
+        eval_T = 7.0 / 365.0
+        profits = [
+            cls.black_scholes(
                 S=curr_p, K=suggested_strike, T=eval_T, r=risk_free_rate, sigma=current_iv, option_type='call'
-            )
-            
-            pl_dollars = (opt_price_at_target_date * 100) - current_cost
-            
-            prices.append(curr_p)
-            profits.append(pl_dollars)
-            curr_p += step
+            ) * 100 - current_cost
+            for curr_p in prices
+        ]
             
         return {
             "suggested_strike": suggested_strike,
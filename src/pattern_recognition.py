@@ -16,7 +16,8 @@ class PatternRecognition:
             df: DataFrame with OHLC data
             
         Returns:
-            List of detected patterns with dates and types
+            List of detected patterns with dates and types; 'kind' is a stable
+            machine-readable key for the pattern (e.g. 'bullish_engulfing')
         """
         patterns = []
         
@@ -30,6 +31,7 @@ class PatternRecognition:
                 patterns.append({
                     'date': df.index[i],
                     'pattern': 'Doji',
+                    'kind': 'doji',
                     'signal': 'Neutral/Reversal',
                     'price': curr['Close']
                 })
@@ -39,6 +41,7 @@ class PatternRecognition:
                 patterns.append({
                     'date': df.index[i],
                     'pattern': 'Hammer',
+                    'kind': 'hammer',
                     'signal': 'Bullish Reversal',
                     'price': curr['Close']
                 })
@@ -48,6 +51,7 @@ class PatternRecognition:
                 patterns.append({
                     'date': df.index[i],
                     'pattern': 'Shooting Star',
+                    'kind': 'shooting_star',
                     'signal': 'Bearish Reversal',
                     'price': curr['Close']
                 })
@@ -58,6 +62,7 @@ class PatternRecognition:
                     patterns.append({
                         'date': df.index[i],
                         'pattern': 'Bullish Engulfing',
+                        'kind': 'bullish_engulfing',
                         'signal': 'Bullish Reversal',
                         'price': curr['Close']
                     })
@@ -65,6 +70,7 @@ class PatternRecognition:
                     patterns.append({
                         'date': df.index[i],
                         'pattern': 'Bearish Engulfing',
+                        'kind': 'bearish_engulfing',
                         'signal': 'Bearish Reversal',
                         'price': curr['Close']
                     })
@@ -9,7 +9,7 @@ from src.database import Database
 from src.models import Stock
 from src.analyzer import StockAnalyzer
 from src.alerts.alert_engine import AlertEngine
-from src.utils import save_analysis
+from src.utils import save_analysis, save_news_articles
 
 # Configure logging
 logging.basicConfig(
@@ -40,6 +40,8 @@ async def analyze_ticker(analyzer, alert_engine, ticker):
             try:
                 save_analysis(db, analysis)
                 logger.info(f"Saved analysis for {ticker} to database")
+                stored = save_news_articles(db, analysis)
+                logger.info(f"Stored {stored} new headlines for {ticker}")
             except Exception as e:
                 logger.error(f"Failed to save analysis for {ticker}: {e}")
             
@@ -1,13 +1,38 @@
 
 import streamlit as st
 import pandas as pd
+import asyncio
 from datetime import datetime
 from src.database import Database
-from src.models import Stock, Analysis
-from src.analyzer import StockAnalysis
+from src.models import Stock, Analysis, News
+from src.analyzer import StockAnalysis, StockAnalyzer
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_cached_tickers(_db: Database) -> list[str]:
+    """All analyzed tickers for the history pickers, served from memory between reruns"""
+    return _db.get_all_tickers()
+
+@st.cache_resource
+def get_shared_analyzer() -> StockAnalyzer:
+    """One StockAnalyzer per process, shared by the dashboard and every page"""
+    return StockAnalyzer()
+
+@st.cache_data(ttl=300, max_entries=100, show_spinner=False)
+def get_cached_analysis(ticker: str) -> StockAnalysis:
+    """
+    Base analysis for a ticker, reused for five minutes so re-selecting it skips the full pipeline.
+    Runs its own event loop, so call it from a worker thread inside async code; failures raise so they aren't cached.
+    """
+    analysis = asyncio.run(get_shared_analyzer().analyze(ticker))
+    if analysis is None:
+        raise ValueError(f"Analysis failed for {ticker}")
+    return analysis
+
 
 def save_analysis(db: Database, analysis: StockAnalysis):
     """Shared logic to save analysis results to the database"""
+    # Only a ticker the pickers don't list yet needs their cache dropped
+    is_new_ticker = analysis.ticker not in get_cached_tickers(db)
     session = db.SessionLocal()
     try:
         # Get or create stock
@@ -69,6 +94,39 @@ def save_analysis(db: Database, analysis: StockAnalysis):
         
         session.add(analysis_record)
         session.commit()
+        # A first analysis of a ticker adds it to the history pickers
+        if is_new_ticker:
+            get_cached_tickers.clear()
+    finally:
+        session.close()
+
+def save_news_articles(db: Database, analysis: StockAnalysis) -> int:
+    """
+    Store an analysis' scored headlines, skipping ones already saved for the stock.
+    
+    Articles without a link are left out: NULL urls never conflict on the
+    (stock_id, url) constraint, so they would be re-inserted on every sync.
+    
+    Returns:
+        Number of new headlines stored
+    """
+    session = db.SessionLocal()
+    try:
+        stock = db.get_or_create_stock(session, analysis.ticker)
+        inserted = News.bulk_upsert(session, [
+            {
+                "stock_id": stock.id,
+                "headline": article["title"],
+                "url": article["link"],
+                "published_date": _safe_datetime(article.get("timestamp")),
+                "sentiment_score": _safe_float(article.get("sentiment_score")),
+                "source": article.get("publisher"),
+            }
+            for article in analysis.news_articles
+            if article.get("link")
+        ])
+        session.commit()
+        return inserted
     finally:
         session.close()
 
@@ -1,10 +1,15 @@
 """Admin Dashboard — Activity Tracking & User Management"""
 
+import io
+import functools
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy import func, desc
 from src.database import Database
 from src.models import User, UserActivity
@@ -14,35 +19,315 @@ from src.models import User, UserActivity
 # Helper: load activity data
 # ──────────────────────────────────────────────
 
-def _load_activity(session: Session, days: int = 30) -> pd.DataFrame:
-    """Return all UserActivity rows as a DataFrame, filtered to the last N days."""
-    cutoff = datetime.utcnow() - timedelta(days=days)
-    rows = (
+# Max rows shown in the user drill-down grid (the CSV export is never capped)
+RAW_ROW_LIMIT = 5000
+# Rows read per round-trip while streaming the CSV export
+EXPORT_CHUNK_ROWS = 5000
+# Rows per page in the Raw Activity Log
+RAW_PAGE_SIZE = 200
+
+# Display headers for row-level activity tables (applied by st.dataframe, no renamed copy)
+ACTIVITY_COLUMN_LABELS = {
+    "ts_str": "Time",
+    "username": "User",
+    "feature": "Feature",
+    "action": "Action",
+    "ticker": "Ticker",
+    "duration_seconds": "Duration (s)",
+}
+
+ADMIN_TABS = [
+    "📊 Overview",
+    "⚙️ Feature Usage",
+    "👤 User Breakdown",
+    "📈 Ticker Popularity",
+    "🗂️ Raw Activity Log",
+    "🔧 User Management",
+]
+
+
+def _cutoff(days: int) -> datetime:
+    return datetime.utcnow() - timedelta(days=days)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _usernames_by_id(_db: Database) -> Dict[int, str]:
+    """Small user_id -> username map, so activity queries don't join the users table."""
+    with _db.get_session() as session:
+        return dict(session.query(User.id, User.username).all())
+
+
+def _activity_query(session: Session, days: int, user_id: Optional[int] = None,
+                    feature: Optional[str] = None, tickers: Optional[Tuple[str, ...]] = None):
+    """Row-level UserActivity query for the window, with optional SQL-side filters."""
+    query = (
         session.query(
-            UserActivity.id,
             UserActivity.user_id,
-            User.username,
             UserActivity.feature,
             UserActivity.action,
             UserActivity.ticker,
             UserActivity.duration_seconds,
             UserActivity.timestamp,
         )
-        .join(User, User.id == UserActivity.user_id)
-        .filter(UserActivity.timestamp >= cutoff)
-        .order_by(desc(UserActivity.timestamp))
-        .all()
+        .filter(UserActivity.timestamp >= _cutoff(days))
     )
-    if not rows:
-        return pd.DataFrame()
-    df = pd.DataFrame(rows, columns=[
-        "id", "user_id", "username", "feature", "action",
-        "ticker", "duration_seconds", "timestamp"
-    ])
+    if user_id is not None:
+        query = query.filter(UserActivity.user_id == user_id)
+    if feature:
+        query = query.filter(UserActivity.feature == feature)
+    if tickers is not None:
+        query = query.filter(UserActivity.ticker.in_(tickers))
+    return query
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_activity(_db: Database, days: int = 30, user_id: Optional[int] = None,
+                   feature: Optional[str] = None, tickers: Optional[Tuple[str, ...]] = None,
+                   offset: int = 0, limit: int = RAW_ROW_LIMIT) -> pd.DataFrame:
+    """Return one page of the most recent UserActivity rows in the last N days, filtered in SQL."""
+    with _db.get_session() as session:
+        query = (
+            _activity_query(session, days, user_id, feature, tickers)
+            .order_by(desc(UserActivity.timestamp))
+            .offset(offset)
+            .limit(limit)
+        )
+        # Let pandas consume the result set straight into Arrow-backed columns
+        # instead of building ORM Row tuples and re-parsing them
+        df = pd.read_sql(query.statement, session.connection(), dtype_backend="pyarrow")
+    user_ids = df.pop("user_id")
+    df.insert(0, "username", user_ids.map(_usernames_for(_db, user_ids)))
     df["timestamp"] = pd.to_datetime(df["timestamp"])
+    df["duration_seconds"] = pd.to_numeric(df["duration_seconds"], downcast="float")
+    # strftime is a per-row Python loop; format once here rather than on every rerun
+    df["ts_str"] = df["timestamp"].dt.strftime("%Y-%m-%d %H:%M:%S").astype("string")
+    # Low-cardinality labels: dictionary-encode so filters compare codes, not strings
+    for col in ("username", "feature", "action", "ticker"):
+        df[col] = df[col].astype("category")
+    return df
+
+
+def _usernames_for(_db: Database, user_ids: pd.Series) -> Dict[int, str]:
+    """Cached username map, refreshed if any of the given ids is missing from it."""
+    names = _usernames_by_id(_db)
+    if not set(user_ids.unique()) <= names.keys():
+        # A user registered since the map was cached
+        _usernames_by_id.clear()
+        names = _usernames_by_id(_db)
+    return names
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _count_activity(_db: Database, days: int, user_id: Optional[int] = None,
+                    feature: Optional[str] = None, tickers: Optional[Tuple[str, ...]] = None) -> int:
+    """Number of rows _load_activity can page through for the same filters."""
+    with _db.get_session() as session:
+        query = _activity_query(session, days, user_id, feature, tickers)
+        return query.with_entities(func.count(UserActivity.id)).scalar()
+
+
+# ──────────────────────────────────────────────
+# Helpers: SQL-side aggregates (only small result sets cross the wire)
+# ──────────────────────────────────────────────
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _overview_kpis_sql(_db: Database, days: int) -> Dict[str, Any]:
+    """Registered users, active users, event total and top ticker in one round-trip."""
+    cutoff = _cutoff(days)
+    with _db.get_session() as session:
+        top_ticker = (
+            session.query(UserActivity.ticker)
+            .filter(UserActivity.timestamp >= cutoff, UserActivity.ticker.isnot(None))
+            .group_by(UserActivity.ticker)
+            .order_by(func.count(UserActivity.id).desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        total_users = session.query(func.count(User.id)).scalar_subquery()
+        row = (
+            session.query(
+                total_users,
+                func.count(func.distinct(UserActivity.user_id)),
+                func.count(UserActivity.id),
+                top_ticker,
+            )
+            .filter(UserActivity.timestamp >= cutoff)
+            .one()
+        )
+    return {
+        "total_users": row[0] or 0,
+        "active_users": row[1] or 0,
+        "total_events": row[2] or 0,
+        "top_ticker": row[3] or "N/A",
+    }
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _feature_stats_sql(_db: Database, days: int) -> pd.DataFrame:
+    """Events, unique users and average duration per feature."""
+    with _db.get_session() as session:
+        total_events = func.count(UserActivity.id)
+        rows = (
+            session.query(
+                UserActivity.feature,
+                total_events,
+                func.count(func.distinct(UserActivity.user_id)),
+                func.avg(UserActivity.duration_seconds),
+            )
+            .filter(UserActivity.timestamp >= _cutoff(days))
+            .group_by(UserActivity.feature)
+            .order_by(total_events.desc())
+            .all()
+        )
+    df = pd.DataFrame(rows, columns=["feature", "total_events", "unique_users", "avg_duration"])
+    # Postgres AVG returns Decimal; keep the column numeric for vectorized formatting
+    df["avg_duration"] = df["avg_duration"].astype(float)
     return df
 
 
+@st.cache_data(ttl=60, show_spinner=False)
+def _action_stats_sql(_db: Database, days: int, feature: str) -> pd.DataFrame:
+    """Event count per action within one feature."""
+    with _db.get_session() as session:
+        count = func.count(UserActivity.id)
+        rows = (
+            session.query(UserActivity.action, count)
+            .filter(UserActivity.timestamp >= _cutoff(days), UserActivity.feature == feature)
+            .group_by(UserActivity.action)
+            .order_by(count.desc())
+            .all()
+        )
+    return pd.DataFrame(rows, columns=["action", "count"])
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _user_stats_sql(_db: Database, days: int) -> pd.DataFrame:
+    """Per-user event totals, feature breadth, last activity and most used feature."""
+    cutoff = _cutoff(days)
+    with _db.get_session() as session:
+        total_events = func.count(UserActivity.id)
+        totals = (
+            session.query(
+                UserActivity.user_id,
+                User.username,
+                total_events,
+                func.count(func.distinct(UserActivity.feature)),
+                func.max(UserActivity.timestamp),
+            )
+            .join(User, User.id == UserActivity.user_id)
+            .filter(UserActivity.timestamp >= cutoff)
+            .group_by(UserActivity.user_id, User.username)
+            .order_by(total_events.desc())
+            .all()
+        )
+        per_feature = (
+            session.query(UserActivity.user_id, UserActivity.feature, total_events)
+            .filter(UserActivity.timestamp >= cutoff)
+            .group_by(UserActivity.user_id, UserActivity.feature)
+            .order_by(total_events.desc())
+            .all()
+        )
+    df = pd.DataFrame(totals, columns=["user_id", "username", "total_events", "unique_features", "last_active"])
+    if df.empty:
+        return df
+    df["last_active"] = pd.to_datetime(df["last_active"])
+    for col in ("user_id", "total_events", "unique_features"):
+        df[col] = pd.to_numeric(df[col], downcast="unsigned")
+    df["last_active_str"] = df["last_active"].dt.strftime("%Y-%m-%d %H:%M")
+    # Rows arrive busiest-first, so the first row per user is their top feature
+    top = (
+        pd.DataFrame(per_feature, columns=["user_id", "top_feature", "n"])
+        .drop_duplicates("user_id")[["user_id", "top_feature"]]
+    )
+    # A left merge keeps the SQL ordering of `df`
+    return df.merge(top, on="user_id", how="left")
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _ticker_stats_sql(_db: Database, days: int, top_n: int = 20) -> pd.DataFrame:
+    """Most searched tickers."""
+    with _db.get_session() as session:
+        searches = func.count(UserActivity.id)
+        rows = (
+            session.query(UserActivity.ticker, searches)
+            .filter(UserActivity.timestamp >= _cutoff(days), UserActivity.ticker.isnot(None))
+            .group_by(UserActivity.ticker)
+            .order_by(searches.desc())
+            .limit(top_n)
+            .all()
+        )
+    return pd.DataFrame(rows, columns=["ticker", "searches"])
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _ticker_values_sql(_db: Database, days: int) -> pd.Series:
+    """Distinct tickers seen in the window."""
+    with _db.get_session() as session:
+        rows = (
+            session.query(UserActivity.ticker)
+            .filter(UserActivity.timestamp >= _cutoff(days), UserActivity.ticker.isnot(None))
+            .distinct()
+            .all()
+        )
+    # Arrow-backed so substring matching runs in pyarrow's compute kernels
+    return pd.Series([r[0] for r in rows], dtype="string[pyarrow]")
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _daily_trend_sql(_db: Database, days: int) -> pd.DataFrame:
+    """Event count per calendar day."""
+    with _db.get_session() as session:
+        day = func.date(UserActivity.timestamp)
+        rows = (
+            session.query(day, func.count(UserActivity.id))
+            .filter(UserActivity.timestamp >= _cutoff(days))
+            .group_by(day)
+            .order_by(day)
+            .all()
+        )
+    df = pd.DataFrame(rows, columns=["date", "events"])
+    df["date"] = pd.to_datetime(df["date"])
+    return df
+
+
+def _clear_admin_caches():
+    """Drop cached activity frames so the next rerun reflects fresh writes."""
+    for loader in (_usernames_by_id, _load_activity, _count_activity, _overview_kpis_sql,
+                   _feature_stats_sql, _action_stats_sql, _user_stats_sql,
+                   _ticker_stats_sql, _ticker_values_sql, _daily_trend_sql):
+        loader.clear()
+
+
+# Column types of the CSV export, fixed so every streamed chunk matches the header
+EXPORT_SCHEMA = pa.schema([
+    ("username", pa.string()),
+    ("feature", pa.string()),
+    ("action", pa.string()),
+    ("ticker", pa.string()),
+    ("duration_seconds", pa.float64()),
+    ("timestamp", pa.timestamp("us")),
+])
+
+
+def _activity_csv_bytes(db: Database, days: int, user_id: Optional[int] = None,
+                        feature: Optional[str] = None, tickers: Optional[Tuple[str, ...]] = None) -> bytes:
+    """Every matching row as CSV, read in chunks and written with Arrow's native writer."""
+    buf = io.BytesIO()
+    with db.get_session() as session, pa_csv.CSVWriter(buf, EXPORT_SCHEMA) as writer:
+        query = (
+            _activity_query(session, days, user_id, feature, tickers)
+            .order_by(desc(UserActivity.timestamp))
+        )
+        for chunk in pd.read_sql(query.statement, session.connection(),
+                                 dtype_backend="pyarrow", chunksize=EXPORT_CHUNK_ROWS):
+            user_ids = chunk.pop("user_id")
+            chunk.insert(0, "username", user_ids.map(_usernames_for(db, user_ids)))
+            chunk["timestamp"] = pd.to_datetime(chunk["timestamp"])
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            writer.write_table(table.select(EXPORT_SCHEMA.names).cast(EXPORT_SCHEMA))
+    return buf.getvalue()
+
+
 def _mini_bar(df: pd.DataFrame, x_col: str, y_col: str, title: str, color: str = "#2576d2") -> go.Figure:
     fig = go.Figure(go.Bar(
         x=df[x_col], y=df[y_col],
@@ -61,50 +346,130 @@ def _mini_bar(df: pd.DataFrame, x_col: str, y_col: str, title: str, color: str =
     return fig
 
 
+def _render_user_management(db: Database, session: Session, days: int):
+    """User table plus the subscription tier and feature permission forms."""
+    st.subheader("Manage Users")
+
+    users = session.query(User).options(load_only(
+        User.id, User.username, User.email, User.tier,
+        User.can_use_swing_trading, User.created_at
+    )).all()
+    if not users:
+        st.info("No users found.")
+        return
+
+    user_stats = _user_stats_sql(db, days)
+    events_by_user = user_stats.set_index("user_id")["total_events"]
+    user_data = pd.DataFrame([{
+        "ID": user.id,
+        "Username": user.username,
+        "Email": user.email,
+        "Tier": user.tier,
+        "Swing Access": "✅" if user.can_use_swing_trading else "❌",
+        "Joined": user.created_at.strftime("%Y-%m-%d") if user.created_at else "N/A"
+    } for user in users])
+    # One vectorized lookup for every user's event count (0 for inactive users)
+    user_data.insert(5, "Events (Period)",
+                     user_data["ID"].map(events_by_user).fillna(0).astype(int))
+
+    st.dataframe(user_data, use_container_width=True, hide_index=True)
+
+    st.divider()
+    st.subheader("Update Subscription Tier")
+    col1, col2, col3 = st.columns(3)
+    users_by_name = {u.username: u for u in users}
+    modifiable_users = [u.username for u in users if u.tier != 'admin']
+
+    with col1:
+        if not modifiable_users:
+            st.info("No modifiable users found.")
+            return
+        target_username = st.selectbox("Select User", options=modifiable_users, key="mgmt_user")
+    with col2:
+        target_user = users_by_name.get(target_username)
+        current_tier = target_user.tier if target_user else "free"
+        st.metric("Current Tier", current_tier)
+    with col3:
+        new_tier = st.selectbox(
+            "New Tier", options=['free', 'premium'],
+            index=['free', 'premium'].index(current_tier) if current_tier in ['free', 'premium'] else 0,
+            key="mgmt_tier"
+        )
+
+    if st.button("Update Subscription", type="primary", key="mgmt_update"):
+        if target_user and current_tier != new_tier:
+            target_user.tier = new_tier
+            session.commit()
+            _clear_admin_caches()
+            st.success(f"✅ Updated {target_username} to `{new_tier}` tier!")
+            st.rerun()
+        elif current_tier == new_tier:
+            st.info("No changes made.")
+
+    st.divider()
+    st.subheader("Feature Permissions")
+    if target_user:
+        swing_access = st.checkbox(
+            "Enable Swing Trading Access", 
+            value=target_user.can_use_swing_trading,
+            key="mgmt_swing_access"
+        )
+        if swing_access != target_user.can_use_swing_trading:
+            if st.button("Save Permissions", type="secondary"):
+                target_user.can_use_swing_trading = swing_access
+                session.commit()
+                _clear_admin_caches()
+                st.success(f"✅ Updated Swing Trading access for {target_username}!")
+                st.rerun()
+
+
 # ──────────────────────────────────────────────
 # Main entry point
 # ──────────────────────────────────────────────
 
-def show_admin_dashboard(db: Database, session: Session):
+def _require_admin(fn):
+    """Stop before any query runs unless the current user is an admin."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if st.session_state.get('user_tier') != 'admin':
+            st.error("Unauthorized Access. Admin privileges required.")
+            return None
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+@_require_admin
+def show_admin_dashboard(db: Database):
     st.title("🛡️ Admin Dashboard")
     st.markdown("Monitor user activity, feature engagement, and manage subscriptions.")
     st.divider()
 
-    # Auth guard
-    if st.session_state.get('user_tier') != 'admin':
-        st.error("Unauthorized Access. Admin privileges required.")
-        return
-
     # Date range filter (sidebar-style)
     col_filter1, col_filter2 = st.columns([3, 1])
     with col_filter2:
         days = st.selectbox("Data Window", [7, 14, 30, 60, 90], index=2, key="admin_days")
 
-    # Load activity data
-    df = _load_activity(session, days=days)
-    all_users = session.query(User).all()
-    has_data = not df.empty
-
-    # ── 6 Tabs ──────────────────────────────────
-    tab_overview, tab_features, tab_users, tab_tickers, tab_raw, tab_manage = st.tabs([
-        "📊 Overview",
-        "⚙️ Feature Usage",
-        "👤 User Breakdown",
-        "📈 Ticker Popularity",
-        "🗂️ Raw Activity Log",
-        "🔧 User Management",
-    ])
+    # Aggregates are computed in SQL; only the raw log and drill-down pull rows
+    feature_stats = _feature_stats_sql(db, days)
+    has_data = not feature_stats.empty
+
+    # ── 6 Sections ──────────────────────────────
+    # A radio instead of st.tabs: st.tabs executes every tab body on each rerun,
+    # whereas only the selected section's queries and figures are built here.
+    active_tab = st.radio("Section", ADMIN_TABS, horizontal=True,
+                          key="admin_tab", label_visibility="collapsed")
 
     # ─────────────────────────────────
     # TAB 1: Overview
     # ─────────────────────────────────
-    with tab_overview:
+    if active_tab == "📊 Overview":
         st.subheader(f"Platform Overview — Last {days} Days")
 
-        total_users = len(all_users)
-        active_users = df["user_id"].nunique() if has_data else 0
-        total_events = len(df) if has_data else 0
-        top_ticker = df["ticker"].mode()[0] if has_data and df["ticker"].notna().any() else "N/A"
+        kpis = _overview_kpis_sql(db, days)
+        total_users = kpis["total_users"]
+        active_users = kpis["active_users"]
+        total_events = kpis["total_events"]
+        top_ticker = kpis["top_ticker"]
 
         m1, m2, m3, m4 = st.columns(4)
         m1.metric("Total Registered Users", total_users)
@@ -117,12 +482,7 @@ def show_admin_dashboard(db: Database, session: Session):
         if has_data:
             st.divider()
             st.subheader("Daily Activity Trend")
-            daily = (
-                df.groupby(df["timestamp"].dt.date)
-                .size()
-                .reset_index(name="events")
-                .rename(columns={"timestamp": "date"})
-            )
+            daily = _daily_trend_sql(db, days)
             fig_trend = go.Figure(go.Scatter(
                 x=daily["date"], y=daily["events"],
                 mode="lines+markers",
@@ -144,23 +504,14 @@ def show_admin_dashboard(db: Database, session: Session):
     # ─────────────────────────────────
     # TAB 2: Feature Usage
     # ─────────────────────────────────
-    with tab_features:
+    if active_tab == "⚙️ Feature Usage":
         st.subheader("Feature Engagement Breakdown")
 
         if has_data:
-            feature_stats = (
-                df.groupby("feature")
-                .agg(
-                    total_events=("id", "count"),
-                    unique_users=("user_id", "nunique"),
-                    avg_duration=("duration_seconds", "mean")
-                )
-                .reset_index()
-                .sort_values("total_events", ascending=False)
-            )
-            feature_stats["avg_duration"] = feature_stats["avg_duration"].apply(
-                lambda x: f"{x:.0f}s" if pd.notna(x) else "N/A"
-            )
+            feature_table = feature_stats.copy()
+            feature_table["avg_duration"] = (
+                feature_table["avg_duration"].round().astype("Int64").astype("string") + "s"
+            ).fillna("N/A")
 
             # Bar chart
             fig_feat = _mini_bar(feature_stats, "feature", "total_events",
@@ -170,7 +521,7 @@ def show_admin_dashboard(db: Database, session: Session):
             # Table
             st.markdown("### Detailed Stats")
             st.dataframe(
-                feature_stats.rename(columns={
+                feature_table.rename(columns={
                     "feature": "Feature",
                     "total_events": "Total Events",
                     "unique_users": "Unique Users",
@@ -184,16 +535,10 @@ def show_admin_dashboard(db: Database, session: Session):
             st.markdown("### Action Breakdown by Feature")
             selected_feature = st.selectbox(
                 "Select Feature",
-                options=df["feature"].unique().tolist(),
+                options=feature_stats["feature"].tolist(),
                 key="admin_feat_select"
             )
-            action_df = (
-                df[df["feature"] == selected_feature]
-                .groupby("action")
-                .size()
-                .reset_index(name="count")
-                .sort_values("count", ascending=False)
-            )
+            action_df = _action_stats_sql(db, days, selected_feature)
             fig_act = _mini_bar(action_df, "action", "count",
                                 f"Actions in {selected_feature}", "#FF6D00")
             st.plotly_chart(fig_act, use_container_width=True)
@@ -203,31 +548,19 @@ def show_admin_dashboard(db: Database, session: Session):
     # ─────────────────────────────────
     # TAB 3: User Breakdown
     # ─────────────────────────────────
-    with tab_users:
+    if active_tab == "👤 User Breakdown":
         st.subheader("Per-User Activity Summary")
 
         if has_data:
-            user_stats = (
-                df.groupby(["user_id", "username"])
-                .agg(
-                    total_events=("id", "count"),
-                    unique_features=("feature", "nunique"),
-                    last_active=("timestamp", "max"),
-                    top_feature=("feature", lambda x: x.mode()[0])
-                )
-                .reset_index()
-                .sort_values("total_events", ascending=False)
-            )
-            user_stats["last_active"] = user_stats["last_active"].dt.strftime("%Y-%m-%d %H:%M")
-
+            user_stats = _user_stats_sql(db, days)
             st.dataframe(
-                user_stats[["username", "total_events", "unique_features", "top_feature", "last_active"]]
+                user_stats[["username", "total_events", "unique_features", "top_feature", "last_active_str"]]
                 .rename(columns={
                     "username": "User",
                     "total_events": "Events",
                     "unique_features": "Features Used",
                     "top_feature": "Favourite Feature",
-                    "last_active": "Last Active"
+                    "last_active_str": "Last Active"
                 }),
                 use_container_width=True, hide_index=True
             )
@@ -239,16 +572,16 @@ def show_admin_dashboard(db: Database, session: Session):
                 options=user_stats["username"].tolist(),
                 key="admin_user_select"
             )
-            user_df = df[df["username"] == selected_user].copy()
-            user_df["timestamp"] = user_df["timestamp"].dt.strftime("%Y-%m-%d %H:%M:%S")
+            ids_by_name = dict(zip(user_stats["username"], user_stats["user_id"]))
+            selected_id = int(ids_by_name[selected_user])
+            user_df = _load_activity(db, days=days, user_id=selected_id)
+            n_user_events = _count_activity(db, days, user_id=selected_id)
+            if n_user_events > len(user_df):
+                st.caption(f"Showing the latest {len(user_df):,} of {n_user_events:,} events — "
+                           "the Raw Activity Log export includes all of them")
             st.dataframe(
-                user_df[["timestamp", "feature", "action", "ticker", "duration_seconds"]].rename(columns={
-                    "timestamp": "Time",
-                    "feature": "Feature",
-                    "action": "Action",
-                    "ticker": "Ticker",
-                    "duration_seconds": "Duration (s)"
-                }),
+                user_df[["ts_str", "feature", "action", "ticker", "duration_seconds"]],
+                column_config=ACTIVITY_COLUMN_LABELS,
                 use_container_width=True, hide_index=True
             )
         else:
@@ -257,18 +590,11 @@ def show_admin_dashboard(db: Database, session: Session):
     # ─────────────────────────────────
     # TAB 4: Ticker Popularity
     # ─────────────────────────────────
-    with tab_tickers:
+    if active_tab == "📈 Ticker Popularity":
         st.subheader("Most Searched Tickers")
 
-        if has_data and df["ticker"].notna().any():
-            ticker_df = (
-                df[df["ticker"].notna()]
-                .groupby("ticker")
-                .size()
-                .reset_index(name="searches")
-                .sort_values("searches", ascending=False)
-                .head(20)
-            )
+        ticker_df = _ticker_stats_sql(db, days)
+        if not ticker_df.empty:
             fig_tick = _mini_bar(ticker_df, "ticker", "searches",
                                  "Top 20 Tickers by Search Count", "#AA00FF")
             st.plotly_chart(fig_tick, use_container_width=True)
@@ -283,119 +609,66 @@ def show_admin_dashboard(db: Database, session: Session):
     # ─────────────────────────────────
     # TAB 5: Raw Activity Log
     # ─────────────────────────────────
-    with tab_raw:
+    if active_tab == "🗂️ Raw Activity Log":
         st.subheader("Raw Activity Log")
 
         if has_data:
+            user_stats = _user_stats_sql(db, days)
+            ids_by_name = dict(zip(user_stats["username"], user_stats["user_id"]))
+            total_events = _overview_kpis_sql(db, days)["total_events"]
             # Filters
             fc1, fc2, fc3 = st.columns(3)
             with fc1:
-                f_user = st.selectbox("Filter by User", ["All"] + df["username"].unique().tolist(), key="raw_user")
+                f_user = st.selectbox("Filter by User", ["All"] + user_stats["username"].tolist(), key="raw_user")
             with fc2:
-                f_feat = st.selectbox("Filter by Feature", ["All"] + df["feature"].unique().tolist(), key="raw_feat")
+                f_feat = st.selectbox("Filter by Feature", ["All"] + feature_stats["feature"].tolist(), key="raw_feat")
             with fc3:
                 f_ticker = st.text_input("Filter by Ticker", key="raw_ticker").strip().upper()
 
-            filtered = df.copy()
-            if f_user != "All":
-                filtered = filtered[filtered["username"] == f_user]
-            if f_feat != "All":
-                filtered = filtered[filtered["feature"] == f_feat]
-            if f_ticker:
-                filtered = filtered[filtered["ticker"].str.upper().str.contains(f_ticker, na=False)]
-
-            st.caption(f"Showing {len(filtered):,} of {len(df):,} events")
-
-            display = filtered[["timestamp", "username", "feature", "action", "ticker", "duration_seconds"]].copy()
-            display["timestamp"] = display["timestamp"].dt.strftime("%Y-%m-%d %H:%M:%S")
-            st.dataframe(
-                display.rename(columns={
-                    "timestamp": "Time", "username": "User",
-                    "feature": "Feature", "action": "Action",
-                    "ticker": "Ticker", "duration_seconds": "Duration (s)"
-                }),
-                use_container_width=True, hide_index=True, height=400
+            filters = dict(
+                user_id=None if f_user == "All" else int(ids_by_name[f_user]),
+                feature=None if f_feat == "All" else f_feat,
+                tickers=None,
             )
+            if f_ticker:
+                # Match the handful of distinct tickers in memory, then filter rows with IN (...) in SQL
+                known = _ticker_values_sql(db, days)
+                filters["tickers"] = tuple(known[known.str.contains(f_ticker, case=False, regex=False)])
+
+            n_matching = _count_activity(db, days, **filters)
+            n_pages = max(1, -(-n_matching // RAW_PAGE_SIZE))
+            if st.session_state.get("raw_page", 1) > n_pages:
+                st.session_state["raw_page"] = 1
+            page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages,
+                                   step=1, key="raw_page")
+            offset = (page - 1) * RAW_PAGE_SIZE
+            page_df = _load_activity(db, days, offset=offset, limit=RAW_PAGE_SIZE, **filters)
+
+            st.caption(f"Showing events {offset + 1 if n_matching else 0:,}–{offset + len(page_df):,} "
+                       f"of {n_matching:,} matching ({total_events:,} in the period)")
+
+            if not page_df.empty:
+                st.dataframe(
+                    page_df[["ts_str", "username", "feature", "action", "ticker", "duration_seconds"]],
+                    column_config=ACTIVITY_COLUMN_LABELS,
+                    use_container_width=True, hide_index=True, height=400
+                )
 
-            # CSV Export
-            csv = filtered.to_csv(index=False).encode("utf-8")
-            st.download_button(
-                label="📥 Download as CSV",
-                data=csv,
-                file_name=f"user_activity_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
+                # CSV Export of every matching row — built only when clicked
+                st.download_button(
+                    label="📥 Download as CSV",
+                    data=lambda: _activity_csv_bytes(db, days, **filters),
+                    file_name=f"user_activity_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
+                    mime="text/csv",
+                    use_container_width=True
+                )
         else:
             st.info("No activity records found for the selected period.")
 
     # ─────────────────────────────────
     # TAB 6: User Management (existing)
     # ─────────────────────────────────
-    with tab_manage:
-        st.subheader("Manage Users")
-
-        users = session.query(User).all()
-        if not users:
-            st.info("No users found.")
-            return
-
-        user_data = []
-        for user in users:
-            event_count = df[df["user_id"] == user.id].shape[0] if has_data else 0
-            user_data.append({
-                "ID": user.id,
-                "Username": user.username,
-                "Email": user.email,
-                "Tier": user.tier,
-                "Swing Access": "✅" if user.can_use_swing_trading else "❌",
-                "Events (Period)": event_count,
-                "Joined": user.created_at.strftime("%Y-%m-%d") if user.created_at else "N/A"
-            })
-
-        st.dataframe(pd.DataFrame(user_data), use_container_width=True, hide_index=True)
-
-        st.divider()
-        st.subheader("Update Subscription Tier")
-        col1, col2, col3 = st.columns(3)
-        modifiable_users = [u.username for u in users if u.tier != 'admin']
-
-        with col1:
-            if not modifiable_users:
-                st.info("No modifiable users found.")
-                return
-            target_username = st.selectbox("Select User", options=modifiable_users, key="mgmt_user")
-        with col2:
-            target_user = session.query(User).filter(User.username == target_username).first()
-            current_tier = target_user.tier if target_user else "free"
-            st.metric("Current Tier", current_tier)
-        with col3:
-            new_tier = st.selectbox(
-                "New Tier", options=['free', 'premium'],
-                index=['free', 'premium'].index(current_tier) if current_tier in ['free', 'premium'] else 0,
-                key="mgmt_tier"
-            )
-
-        if st.button("Update Subscription", type="primary", key="mgmt_update"):
-            if target_user and current_tier != new_tier:
-                target_user.tier = new_tier
-                session.commit()
-                st.success(f"✅ Updated {target_username} to `{new_tier}` tier!")
-                st.rerun()
-            elif current_tier == new_tier:
-                st.info("No changes made.")
-
-        st.divider()
-        st.subheader("Feature Permissions")
-        if target_user:
-            swing_access = st.checkbox(
-                "Enable Swing Trading Access", 
-                value=target_user.can_use_swing_trading,
-                key="mgmt_swing_access"
-            )
-            if swing_access != target_user.can_use_swing_trading:
-                if st.button("Save Permissions", type="secondary"):
-                    target_user.can_use_swing_trading = swing_access
-                    session.commit()
-                    st.success(f"✅ Updated Swing Trading access for {target_username}!")
-                    st.rerun()
+    if active_tab == "🔧 User Management":
+        # The only section that needs ORM objects; open a session just for it
+        with db.get_session() as session:
+            _render_user_management(db, session, days)
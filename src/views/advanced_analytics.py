@@ -4,9 +4,12 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
+import plotly.io as pio
 import asyncio
+import base64
 from datetime import datetime
-from src.analyzer import StockAnalyzer
+from operator import itemgetter
+from typing import NamedTuple
 from src.data_sources.options_source import OptionsSource
 from src.data_sources.insider_source import InsiderSource
 from src.data_sources.institutional_source import InstitutionalSource
@@ -14,59 +17,627 @@ from src.data_sources.short_interest_source import ShortInterestSource
 from src.data_sources.news_source import NewsSentimentSource
 from src.data_sources.earnings_source import EarningsSource
 from src.pattern_recognition import PatternRecognition
-from src.visualization_advanced import AdvancedVisualizations
 from src.options_calc import OptionsProfitCalculator
 from src.math_models import MonteCarloEngine
-from src.utils import render_ticker_header, save_analysis
+from src.utils import render_ticker_header, save_analysis, get_cached_tickers, get_cached_analysis
+from src.utils_tickers import render_hybrid_ticker_input
 from src.valuations import ValuationCalculator
 from src.reporting import ReportGenerator
 from src.activity_logger import log_activity, log_page_visit
 
 
-def render_candlestick_icon(pattern_type: str):
-    """Render a compact SVG-based candlestick icon for a table row"""
-    p_type = pattern_type.lower()
+class _Sources(NamedTuple):
+    options: OptionsSource
+    insider: InsiderSource
+    institutional: InstitutionalSource
+    short_interest: ShortInterestSource
+    news: NewsSentimentSource
+    earnings: EarningsSource
+
+
+@st.cache_resource
+def _get_sources() -> _Sources:
+    """Shared data-source instances, built once per process like init_analyzer"""
+    return _Sources(
+        OptionsSource(), InsiderSource(), InstitutionalSource(),
+        ShortInterestSource(), NewsSentimentSource(), EarningsSource()
+    )
+
+
+# --- Cached fetchers for the sources without their own st.cache_data layer ---
+# Reruns within the TTL share one network round-trip per ticker.
+
+@st.cache_data(ttl=900, max_entries=100, show_spinner=False)
+def _cached_options(ticker: str) -> dict:
+    return _get_sources().options.fetch_options_data(ticker)
+
+
+@st.cache_data(ttl=900, max_entries=100, show_spinner=False)
+def _cached_institutional(ticker: str) -> dict:
+    return _get_sources().institutional.fetch_institutional_holders(ticker)
+
+
+@st.cache_data(ttl=900, max_entries=100, show_spinner=False)
+def _cached_short_interest(ticker: str) -> dict:
+    return _get_sources().short_interest.fetch_short_interest(ticker)
+
+
+async def _load_all(ticker: str):
+    """
+    Fetch the base analysis and every tab's data concurrently in a single gather.
+    Sync fetchers run in the default executor so their network waits overlap;
+    a failing provider yields None for its tab instead of aborting the page.
+
+    Returns:
+        (analysis, options, insider, institutional, short_interest, news, earnings)
+    """
+    loop = asyncio.get_running_loop()
+    sources = _get_sources()
+    results = await asyncio.gather(
+        loop.run_in_executor(None, get_cached_analysis, ticker),
+        loop.run_in_executor(None, _cached_options, ticker),
+        loop.run_in_executor(None, sources.insider.fetch_insider_activity, ticker),
+        loop.run_in_executor(None, _cached_institutional, ticker),
+        loop.run_in_executor(None, _cached_short_interest, ticker),
+        sources.news.fetch(ticker),
+        sources.earnings.fetch(ticker, limit=12),
+        return_exceptions=True
+    )
+    return tuple(None if isinstance(r, Exception) else r for r in results)
+
+
+@st.cache_resource
+def _pattern_detector() -> PatternRecognition:
+    return PatternRecognition()
+
+
+@st.cache_resource
+def _ai_analyzer():
+    # Deferred: the Gemini SDK is only loaded, and its client built, when a thesis is first requested
+    from src.ai_analyzer import AIAnalyzer
+    return AIAnalyzer()
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _cached_patterns(_history: pd.DataFrame, ticker: str, last_bar: str, n_rows: int) -> list:
+    """Recent candlestick patterns; keyed on the history's last bar and length rather than its contents"""
+    return _pattern_detector().get_recent_patterns(_history, days=30)
+
+
+@st.cache_data(ttl=900, max_entries=20, show_spinner=False)
+def _cached_monte_carlo(_history: pd.DataFrame, ticker: str, last_bar: str, n_rows: int,
+                        current_price: float, days_out: int, num_sims: int):
+    """
+    GBM simulation for one slider setting, reduced to what the chart draws; the history is keyed on its last bar and length.
+    Only the sample paths and percentile bands are kept, so a cache hit doesn't unpickle the full paths matrix.
+    """
+    results = MonteCarloEngine.simulate_gbm(
+        current_price=current_price,
+        history=_history,
+        days_out=days_out,
+        num_simulations=num_sims
+    )
+    if not results:
+        return results
     
-    # Colors
-    bull_color = "#2ecc71"
-    bear_color = "#e74c3c"
-    neutral_color = "#aaa"
+    paths = results.pop('paths')
+    del results['final_prices']
+    # We don't want to draw 10,000 lines (too heavy for browser); keep 100 random sample paths
+    sample_indices = np.random.default_rng(42).choice(paths.shape[1], size=min(100, paths.shape[1]), replace=False, shuffle=False)
+    results['sample_paths'] = paths[:, sample_indices]
+    # Percentiles across all paths
+    results['p5_path'], results['p50_path'], results['p95_path'] = np.percentile(paths, [5, 50, 95], axis=1)
+    return results
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _pl_figure_json(entry: float, target: float, iv: float, days: int):
+    """Theoretical call P/L chart as figure JSON plus the suggested strike, cached per input set"""
+    pl_data = OptionsProfitCalculator.generate_pl_curve(
+        entry_price=entry,
+        target_price=target,
+        current_iv=iv,
+        days_to_exp=days
+    )
     
-    # Canvas
-    svg = '<svg width="40" height="50" viewBox="0 0 40 50" xmlns="http://www.w3.org/2000/svg" style="vertical-align: middle;">'
+    pl_fig = go.Figure()
+    pl_fig.add_trace(go.Scatter(
+        x=pl_data['curve_prices'],
+        y=pl_data['curve_profit_loss'],
+        mode='lines',
+        name="P/L ($)",
+        line=dict(color='rgba(150, 150, 250, 0.8)', width=3),
+        fill='tozeroy'
+    ))
     
-    if 'doji' in p_type:
-        # Doji: Long wick, thin body in middle
-        svg += f'<line x1="20" y1="5" x2="20" y2="45" stroke="{neutral_color}" stroke-width="2" />'
-        svg += f'<line x1="12" y1="25" x2="28" y2="25" stroke="white" stroke-width="2" />'
+    # Add vertical line for entry
+    pl_fig.add_vline(x=entry, line_width=2, line_dash="dash", line_color="orange", annotation_text="Entry")
     
-    elif 'hammer' in p_type:
-        # Hammer: Long lower wick, small body at top
-        svg += f'<line x1="20" y1="10" x2="20" y2="45" stroke="{bull_color}" stroke-width="2" />'
-        svg += f'<rect x="12" y="10" width="16" height="10" fill="{bull_color}" />'
+    # Target horizontal zero line
+    pl_fig.add_hline(y=0, line_width=1, line_color="white")
     
-    elif 'shooting star' in p_type:
-        # Shooting Star: Long upper wick, small body at bottom
-        svg += f'<line x1="20" y1="5" x2="20" y2="40" stroke="{bear_color}" stroke-width="2" />'
-        svg += f'<rect x="12" y="30" width="16" height="10" fill="{bear_color}" />'
+    pl_fig.update_layout(
+        title="Theoretical Profit / Loss at Expiration",
+        xaxis_title="Underlying Stock Price ($)",
+        yaxis_title="Profit/Loss ($)",
+        height=350,
+        margin=dict(l=20, r=20, t=40, b=20)
+    )
+    return pl_fig.to_json(), pl_data['suggested_strike']
+
+
+INSIDER_COLUMNS = ["date", "insider", "position", "transaction_type", "shares", "value"]
+INSIDER_COLUMN_CONFIG = {
+    "date": "Date",
+    "insider": "Executive / Insider",
+    "position": "Position",
+    "transaction_type": "Transaction",
+    "shares": st.column_config.NumberColumn("Shares", format="localized"),
+    "value": st.column_config.NumberColumn("Value ($)", format="dollar"),
+}
+
+
+def _insider_frame(transactions: list) -> pd.DataFrame:
+    """Recent insider transactions as a frame limited to the displayed columns"""
+    return pd.DataFrame.from_records(transactions, columns=INSIDER_COLUMNS)
+
+
+# Holder tables are formatted by the grid itself, so the columns stay numeric (and sortable)
+HOLDER_COLUMNS = ['holder', 'shares', 'value', 'date_reported']
+HOLDER_COLUMN_CONFIG = {
+    "shares": st.column_config.NumberColumn(format="localized"),
+    "value": st.column_config.NumberColumn(format="dollar"),
+}
+
+
+def _holders_frame(holders: list) -> pd.DataFrame:
+    """Holder records as a typed frame limited to the displayed columns"""
+    return pd.DataFrame.from_records(holders, columns=HOLDER_COLUMNS).astype({"shares": "int64", "value": "float64"})
+
+
+# Article fields the news chart plots, pulled straight from the records without a frame
+_NEWS_CHART_FIELDS = itemgetter('sentiment_score', 'sentiment_label', 'title', 'date')
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _cached_excel(_analysis, _dcf, ticker: str, current_price: float, analysis_timestamp: str) -> bytes:
+    """Excel report bytes, keyed on the analysis identity rather than its contents"""
+    return ReportGenerator.generate_excel_report(_analysis, _dcf)
+
+
+# Candlestick icons are constant markup, so build each SVG once at import time
+_BULL_COLOR = "#2ecc71"
+_BEAR_COLOR = "#e74c3c"
+_NEUTRAL_COLOR = "#aaa"
+_SVG_OPEN = '<svg width="40" height="50" viewBox="0 0 40 50" xmlns="http://www.w3.org/2000/svg" style="vertical-align: middle;">'
+
+_ICON_BODIES = {
+    # Doji: Long wick, thin body in middle
+    "doji": (
+        f'<line x1="20" y1="5" x2="20" y2="45" stroke="{_NEUTRAL_COLOR}" stroke-width="2" />'
+        '<line x1="12" y1="25" x2="28" y2="25" stroke="white" stroke-width="2" />'
+    ),
+    # Hammer: Long lower wick, small body at top
+    "hammer": (
+        f'<line x1="20" y1="10" x2="20" y2="45" stroke="{_BULL_COLOR}" stroke-width="2" />'
+        f'<rect x="12" y="10" width="16" height="10" fill="{_BULL_COLOR}" />'
+    ),
+    # Shooting Star: Long upper wick, small body at bottom
+    "shooting_star": (
+        f'<line x1="20" y1="5" x2="20" y2="40" stroke="{_BEAR_COLOR}" stroke-width="2" />'
+        f'<rect x="12" y="30" width="16" height="10" fill="{_BEAR_COLOR}" />'
+    ),
+    # Two candles: Small red, large green
+    "bullish_engulfing": (
+        f'<rect x="8" y="25" width="8" height="15" fill="{_BEAR_COLOR}" />'
+        f'<rect x="24" y="10" width="10" height="35" fill="{_BULL_COLOR}" />'
+    ),
+    # Two candles: Small green, large red
+    "bearish_engulfing": (
+        f'<rect x="8" y="25" width="8" height="15" fill="{_BULL_COLOR}" />'
+        f'<rect x="24" y="10" width="10" height="35" fill="{_BEAR_COLOR}" />'
+    ),
+    # Generic candle for unknown
+    "generic": (
+        f'<line x1="20" y1="5" x2="20" y2="45" stroke="{_NEUTRAL_COLOR}" stroke-width="2" />'
+        f'<rect x="14" y="15" width="12" height="20" fill="{_NEUTRAL_COLOR}" />'
+    ),
+}
+_ICON_SVG = {key: f"{_SVG_OPEN}{body}</svg>" for key, body in _ICON_BODIES.items()}
+
+# (required substrings, icon key) in match-priority order
+_PATTERN_KEYS = (
+    (("doji",), "doji"),
+    (("hammer",), "hammer"),
+    (("shooting star",), "shooting_star"),
+    (("bullish", "engulfing"), "bullish_engulfing"),
+    (("bearish", "engulfing"), "bearish_engulfing"),
+)
+
+
+def _resolve(p_type: str) -> str:
+    """Map a lower-cased pattern name to its icon key"""
+    for needles, key in _PATTERN_KEYS:
+        if all(n in p_type for n in needles):
+            return key
+    return "generic"
+
+
+# Exact names emitted by PatternRecognition, resolved once; anything else falls back to _resolve
+_PATTERN_TO_KIND = {
+    name: _resolve(name)
+    for name in (
+        "doji", "hammer", "shooting star", "bullish engulfing", "bearish engulfing",
+        "support bounce", "resistance breakout (s/r flip)", "resistance rejection",
+    )
+}
+
+
+def _icon_kind(pattern_type: str) -> str:
+    p_type = pattern_type.lower()
+    kind = _PATTERN_TO_KIND.get(p_type)
+    return kind if kind is not None else _resolve(p_type)
+
+
+def render_candlestick_icon(pattern_type: str):
+    """Render a compact SVG-based candlestick icon for a table row"""
+    return _ICON_SVG[_icon_kind(pattern_type)]
+
+
+# Icons as data URIs so the native grid can show them in an ImageColumn
+_ICON_URI = {key: "data:image/svg+xml;base64," + base64.b64encode(svg.encode()).decode() for key, svg in _ICON_SVG.items()}
+
+PATTERN_COLUMN_CONFIG = {
+    "icon": st.column_config.ImageColumn("Icon", width="small"),
+    "date": st.column_config.DateColumn("Date", format="YYYY-MM-DD"),
+    "pattern": "Pattern",
+    "signal": "Signal",
+    "price": st.column_config.NumberColumn("Price", format="$%.2f"),
+}
+
+
+def _patterns_frame(patterns: list) -> pd.DataFrame:
+    """Detected patterns as a frame for st.dataframe, with each row's icon looked up by its kind"""
+    df = pd.DataFrame.from_records(patterns, columns=["date", "pattern", "kind", "signal", "price"])
+    # Rows without a detector-assigned kind fall back to classifying the name
+    missing = df["kind"].isna()
+    if missing.any():
+        df.loc[missing, "kind"] = df.loc[missing, "pattern"].map(_icon_kind)
+    df.insert(0, "icon", df.pop("kind").map(_ICON_URI))
+    return df
+
+
+# --- Tab renderers: pure functions of the data loaded up front ---
+
+def _fmt(value, template: str, default: str = "N/A") -> str:
+    """Format a metric value with a str.format template, or the default when it is missing or zero"""
+    return template.format(value) if value else default
+
+
+def _render_options_tab(options_data, analysis):
+    """Options metrics, put/call interpretation and the theoretical call P/L chart"""
+    st.subheader("Options Metrics")
     
-    elif 'bullish' in p_type and 'engulfing' in p_type:
-        # Two candles: Small red, large green
-        svg += f'<rect x="8" y="25" width="8" height="15" fill="{bear_color}" />'
-        svg += f'<rect x="24" y="10" width="10" height="35" fill="{bull_color}" />'
+    if options_data:
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            iv = options_data.get('implied_volatility', 0)
+            st.metric(
+                "Implied Volatility",
+                _fmt(iv, "{:.2%}"),
+                help="Average IV of at-the-money options"
+            )
+        
+        with col2:
+            pcr = options_data.get('put_call_ratio', 0)
+            st.metric(
+                "Put/Call Ratio",
+                _fmt(pcr, "{:.2f}"),
+                help="Ratio of put volume to call volume"
+            )
+        
+        with col3:
+            exp = options_data.get('nearest_expiration', 'N/A')
+            st.metric(
+                "Nearest Expiration",
+                exp,
+                help="Nearest options expiration date"
+            )
+        
+        st.markdown("---")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            call_vol = options_data.get('total_call_volume', 0)
+            st.metric("Total Call Volume", f"{call_vol:,}")
+        with col2:
+            put_vol = options_data.get('total_put_volume', 0)
+            st.metric("Total Put Volume", f"{put_vol:,}")
+        
+        # Interpretation
+        st.markdown("### Interpretation")
+        if pcr > 1:
+            st.info("📉 Put/Call Ratio > 1: More puts than calls, potentially bearish sentiment")
+        elif pcr < 0.7:
+            st.info("📈 Put/Call Ratio < 0.7: More calls than puts, potentially bullish sentiment")
+        else:
+            st.info("➡️ Put/Call Ratio neutral")
+
+        # Options P/L Curve
+        if analysis.suggested_entry and iv > 0:
+            st.divider()
+            st.subheader("🧪 Theoretical Options Strategy")
+            st.markdown("Based on current IV and the algorithmic **Suggested Entry**.")
+            
+            target_price = analysis.max_buy_price if analysis.max_buy_price else (analysis.suggested_entry * 1.15)
+            
+            pl_fig_json, suggested_strike = _pl_figure_json(analysis.suggested_entry, target_price, iv, 45)
+            
+            st.markdown(f"**Recommended Action:** Buy 1 Call Contract at **${suggested_strike} Strike** expiring in ~45 Days.")
+            st.plotly_chart(pio.from_json(pl_fig_json), use_container_width=True)
+            
+    else:
+        st.warning("No options data available for this ticker")
+
+
+def _render_insider_tab(insider_data):
+    """Six-month insider buy/sell totals and the most recent transactions"""
+    st.subheader("👔 C-Suite & Insider Trading Activity")
+    st.markdown("Tracks the executive buy/sell flow over the last 6 months to gauge internal confidence.")
     
-    elif 'bearish' in p_type and 'engulfing' in p_type:
-        # Two candles: Small green, large red
-        svg += f'<rect x="8" y="25" width="8" height="15" fill="{bull_color}" />'
-        svg += f'<rect x="24" y="10" width="10" height="35" fill="{bear_color}" />'
+    insider_data = insider_data or {}
+    buys, sales, net_shares = (insider_data.get(k, 0) for k in ('six_month_buys', 'six_month_sales', 'net_shares_purchased'))
+    txns = insider_data.get('recent_transactions')
     
+    if buys > 0 or sales > 0 or txns:
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("6-Month Insider Buys", f"{buys:,.0f} shares", 
+                      help="Total shares purchased by insiders in the last 6 months")
+            
+        with col2:
+            st.metric("6-Month Insider Sales", f"{sales:,.0f} shares",
+                      help="Total shares sold by insiders in the last 6 months")
+            
+        with col3:
+            st.metric("Net Accumulation", f"{net_shares:,.0f} shares",
+                      delta="Accumulating" if net_shares > 0 else "Distributing" if net_shares < 0 else "Neutral",
+                      delta_color="normal" if net_shares >= 0 else "inverse")
+                      
+        st.divider()
+        
+        if txns:
+            st.markdown("### Most Recent Transactions")
+            st.dataframe(
+                _insider_frame(txns),
+                column_config=INSIDER_COLUMN_CONFIG, use_container_width=True
+            )
+            
+        # Interpretation
+        st.markdown("### Interpretation")
+        if net_shares > 0:
+            st.success("✅ **Net Insider Buying** — Executives are actively accumulating shares, a strong bullish signal.")
+        elif net_shares < 0:
+            st.warning("⚠️ **Net Insider Selling** — Executives are distributing shares, which can signal caution (though often just for tax/diversification purposes).")
+        else:
+            st.info("➡️ **Neutral** — No significant directional insider activity recently.")
     else:
-        # Generic candle for unknown
-        svg += f'<line x1="20" y1="5" x2="20" y2="45" stroke="{neutral_color}" stroke-width="2" />'
-        svg += f'<rect x="14" y="15" width="12" height="20" fill="{neutral_color}" />'
+        st.warning("No recent SEC Form 4 insider trading data available for this ticker.")
+
+
+def _render_whale_tab(whale_data):
+    """Holdings breakdown plus the top mutual-fund and institutional holders"""
+    st.subheader("Major Institutional Holders")
+    
+    if whale_data:
+        breakdown = whale_data.get('major_holdings_breakdown', {})
+        if breakdown:
+            st.write("**Holdings Breakdown**")
+            b_cols = st.columns(min(len(breakdown), 4))
+            # Floats under 2.0 are raw decimals like 0.65; larger ones are counts
+            formatted = [
+                (desc, (f"{val:.2%}" if val < 2.0 else f"{val:,.0f}") if isinstance(val, float) else str(val))
+                for desc, val in breakdown.items()
+            ]
+            for i, (desc, disp_val) in enumerate(formatted):
+                b_cols[i % 4].metric(desc, disp_val)
+            
+        st.markdown("---")
         
-    svg += '</svg>'
-    return svg
+        wcol1, wcol2 = st.columns(2)
+        
+        with wcol1:
+            st.write("**Top Mutual Fund Holders**")
+            mut_df = _holders_frame(whale_data.get("mutualfund_holders", []))
+            if not mut_df.empty:
+                st.dataframe(mut_df, column_config=HOLDER_COLUMN_CONFIG, use_container_width=True)
+            else:
+                st.info("No mutual fund data available.")
+                
+        with wcol2:
+            st.write("**Top Institutional Holders**")
+            inst_df = _holders_frame(whale_data.get("institutional_holders", []))
+            if not inst_df.empty:
+                st.dataframe(inst_df, column_config=HOLDER_COLUMN_CONFIG, use_container_width=True)
+            else:
+                st.info("No institutional data available.")
+    else:
+        st.warning("No institutional data available for this ticker.")
+
+
+def _render_short_tab(short_data):
+    """Short interest metrics and their interpretation"""
+    st.subheader("Short Interest Metrics")
+    
+    if short_data:
+        short_pct, days_to_cover, change, shares, prior = (short_data.get(k, 0) for k in (
+            'short_percent_of_float', 'short_ratio', 'short_interest_change_pct', 'shares_short', 'shares_short_prior_month'
+        ))
+        
+        # (label, value, delta, help) for one row of metrics
+        metrics = (
+            ("Short % of Float", f"{short_pct:.2f}%", None, "Percentage of float shares sold short"),
+            ("Days to Cover", f"{days_to_cover:.2f}", None, "Days to cover all short positions at average volume"),
+            ("Monthly Change", f"{change:+.2f}%",
+             'Increasing' if change > 0 else 'Decreasing' if change < 0 else 'Flat',
+             "Change in short interest vs. prior month"),
+            ("Shares Short", f"{shares:,}", None, None),
+            ("Prior Month", f"{prior:,}", None, None),
+        )
+        for col, (label, value, delta, help_text) in zip(st.columns(5), metrics):
+            col.metric(label, value, delta=delta, help=help_text)
+        
+        # Interpretation
+        st.markdown("### Interpretation")
+        if short_pct > 20:
+            st.warning("⚠️ High short interest (>20%) - potential short squeeze risk")
+        elif short_pct > 10:
+            st.info("📊 Moderate short interest (10-20%)")
+        else:
+            st.success("✅ Low short interest (<10%)")
+    else:
+        st.warning("No short interest data available")
+
+
+@st.fragment
+def _render_ai_thesis(analysis, ticker, options_data, news_data, earn_data):
+    """On-demand Gemini thesis; a fragment, so the button does not rerun (and reset) the page"""
+    st.markdown("---")
+    col_ai1, col_ai2 = st.columns([3, 1])
+    with col_ai1:
+        st.subheader("🤖 AI-Powered Trade Thesis")
+        st.caption("Powered by Google Gemini")
+    
+    with col_ai2:
+        if st.button("✨ Generate AI Thesis", use_container_width=True):
+            with st.spinner("Synthesizing market data..."):
+                ai = _ai_analyzer()
+                
+                # Construct unified data payload from existing analysis objects
+                payload = {
+                    "current_price": analysis.current_price,
+                    "trend": "Bullish" if analysis.current_price > getattr(analysis, 'sma_50', 0) else "Bearish",
+                    "support": getattr(analysis, 'support_level', "N/A"),
+                    "resistance": getattr(analysis, 'resistance_level', "N/A")
+                }
+                
+                # Extended metrics come from the data already loaded for the tabs
+                if options_data and 'max_pain' in options_data:
+                    payload['hvn'] = options_data['max_pain']
+                    
+                if news_data and news_data.get('articles'):
+                    payload['sentiment'] = {
+                        'score': f"{news_data['average_sentiment']:.2f}",
+                        'label': news_data['sentiment_label']
+                    }
+                    
+                if earn_data and earn_data.get('analyzed_events', 0) > 0:
+                    drift = earn_data.get('avg_t14_return', 0)
+                    payload['earnings'] = {'drift_direction': "Up" if drift > 0 else "Down" if drift < 0 else "Flat"}
+                    
+                thesis = ai.generate_thesis(ticker, payload)
+                
+                st.info(thesis)
+    st.markdown("---")
+
+
+@st.fragment
+def _render_monte_carlo_tab(analysis, ticker):
+    """GBM projection cone; a fragment, so moving its controls reruns only this tab"""
+    st.subheader("10,000-Path Monte Carlo Price Simulation")
+    st.markdown("Projects future price probabilities based on stock's historical volatility and daily returns (Geometric Brownian Motion).")
+    
+    if analysis.history is not None and not analysis.history.empty:
+        col1, col2 = st.columns([1, 1])
+        
+        with col1:
+            days_out = st.slider("Days to Simulate", min_value=14, max_value=90, value=30, step=7)
+        
+        with col2:
+            num_sims = st.selectbox("Number of Simulations", options=[1000, 5000, 10000], index=2)
+        
+        with st.spinner(f"Running {num_sims:,} simulations..."):
+            history = analysis.history
+            mc_results = _cached_monte_carlo(
+                history, ticker, str(history.index[-1]), len(history),
+                analysis.current_price, days_out, num_sims
+            )
+            
+        if mc_results:
+            
+            mc_fig = go.Figure()
+            
+            # Draw the sample paths in light grey
+            sample_paths = mc_results['sample_paths']
+            n_samples = sample_paths.shape[1]
+            
+            x_axis = np.arange(days_out + 1)
+            
+            # Add sample lines as one trace; the NaN after each path breaks the polyline
+            gap = np.full((1, n_samples), np.nan)
+            mc_fig.add_trace(go.Scatter(
+                x=np.tile(np.append(x_axis, np.nan), n_samples),
+                y=np.vstack([sample_paths, gap]).ravel(order='F'),
+                mode='lines',
+                line=dict(color='rgba(150, 150, 150, 0.1)', width=1),
+                showlegend=False,
+                hoverinfo='skip'
+            ))
+                
+            p5_path, p50_path, p95_path = mc_results['p5_path'], mc_results['p50_path'], mc_results['p95_path']
+            
+            # Add Confidence Interval Cone (90% Confidence): out along the 95th, back along the 5th
+            n_pts = len(x_axis)
+            cone_x, cone_y = np.empty(2 * n_pts), np.empty(2 * n_pts)
+            cone_x[:n_pts], cone_x[n_pts:] = x_axis, x_axis[::-1]
+            cone_y[:n_pts], cone_y[n_pts:] = p95_path, p5_path[::-1]
+            mc_fig.add_trace(go.Scatter(
+                x=cone_x,
+                y=cone_y,
+                fill='toself',
+                fillcolor='rgba(0, 100, 250, 0.2)',
+                line=dict(color='rgba(255,255,255,0)'),
+                hoverinfo="skip",
+                name="90% Confidence Interval"
+            ))
+            
+            # Add Median line
+            mc_fig.add_trace(go.Scatter(
+                x=x_axis, y=p50_path,
+                mode='lines',
+                line=dict(color='rgb(50, 150, 250)', width=3, dash='dash'),
+                name="Expected Path (Median)"
+            ))
+            
+            mc_fig.update_layout(
+                title=f"Price Projection Cone ({days_out} Days)",
+                xaxis_title="Trading Days from Today",
+                yaxis_title="Price ($)",
+                height=450,
+                showlegend=True,
+                margin=dict(l=20, r=20, t=40, b=20)
+            )
+            st.plotly_chart(mc_fig, use_container_width=True)
+            
+            prob_up = mc_results['prob_higher'] * 100
+            m1, m2, m3, m4 = st.columns(4)
+            m1.metric("Current Price", _fmt(analysis.current_price, "${:.2f}"))
+            m2.metric("Median Target (30d)", f"${p50_path[-1]:.2f}")
+            m3.metric("Bull Target (95th %ile)", f"${p95_path[-1]:.2f}")
+            m4.metric("Win Probability", f"{prob_up:.1f}%")
+            
+            # Suggested Entry/Stop - MORE PROMINENT
+            st.markdown("---")
+            st.success(f"🎯 **Suggested Trade Setup**")
+            s1, s2 = st.columns(2)
+            s1.markdown(f"👉 **Entry: ${getattr(analysis, 'suggested_entry', 0):.2f}**")
+            s2.markdown(f"🛑 **Stop: ${getattr(analysis, 'suggested_stop_loss', 0):.2f}**")
+            st.markdown("---")
+            
+    else:
+        st.error("Missing historical price data required for simulation.")
 
 
 def render_advanced_analytics_page():
@@ -84,7 +655,7 @@ def render_advanced_analytics_page():
         db = st.session_state.get('db')
         default_ticker = "AAPL"
         if db:
-            db_tickers = db.get_all_tickers()
+            db_tickers = get_cached_tickers(db)
             if db_tickers:
                 selected_history = st.selectbox(
                     "Recent Tickers",
@@ -99,7 +670,6 @@ def render_advanced_analytics_page():
     with st.sidebar:
         st.header("⚙️ Analysis Settings")
         
-        from src.utils_tickers import render_hybrid_ticker_input
         ticker = render_hybrid_ticker_input(key_prefix="adv_anal")
         if not ticker:
             ticker = "AAPL"
@@ -117,17 +687,8 @@ def render_advanced_analytics_page():
     if (analyze_btn or st.session_state.get('auto_run_adv')) and ticker:
 
         with st.spinner(f"Analyzing {ticker}..."):
-            # Initialize sources
-            analyzer = StockAnalyzer()
-            options_source = OptionsSource()
-            insider_source = InsiderSource()
-            whale_source = InstitutionalSource()
-            short_source = ShortInterestSource()
-            news_source = NewsSentimentSource()
-            earn_source = EarningsSource()
-            
-            # Get basic analysis
-            analysis = asyncio.run(analyzer.analyze(ticker))
+            # One event loop per run: the base analysis and all tab data in a single call
+            analysis, options_data, insider_data, whale_data, short_data, news_data, earn_data = asyncio.run(_load_all(ticker))
             
             if analysis:
                 # Save to database
@@ -139,60 +700,12 @@ def render_advanced_analytics_page():
                 if db and _user_id:
                     log_activity(db, _user_id, "Advanced Analytics", "run_analysis", ticker=ticker)
                 
-                from src.ai_analyzer import AIAnalyzer
-                
                 # Render shared header
                 render_ticker_header(analysis)
                 
                 user_tier = st.session_state.get('tier', 'free')
                 if user_tier != 'free':
-                    # --- AI Thesis Generation Block ---
-                    st.markdown("---")
-                    col_ai1, col_ai2 = st.columns([3, 1])
-                    with col_ai1:
-                        st.subheader("🤖 AI-Powered Trade Thesis")
-                        st.caption("Powered by Google Gemini")
-                    
-                    with col_ai2:
-                        if st.button("✨ Generate AI Thesis", use_container_width=True):
-                            with st.spinner("Synthesizing market data..."):
-                                ai = AIAnalyzer()
-                                
-                                # Construct unified data payload from existing analysis objects
-                                payload = {
-                                    "current_price": analysis.current_price,
-                                    "trend": "Bullish" if analysis.current_price > getattr(analysis, 'sma_50', 0) else "Bearish",
-                                    "support": getattr(analysis, 'support_level', "N/A"),
-                                    "resistance": getattr(analysis, 'resistance_level', "N/A")
-                                }
-                                
-                                # Safely attempt to pull extended metrics if available
-                                try:
-                                    opt_data = asyncio.run(options_source.fetch_data(ticker))
-                                    if opt_data and 'max_pain' in opt_data:
-                                        payload['hvn'] = opt_data['max_pain']
-                                except Exception:
-                                    pass
-                                    
-                                try:
-                                    sent_data = news_source.get_sentiment(ticker)
-                                    if sent_data:
-                                        payload['sentiment'] = sent_data
-                                except Exception:
-                                    pass
-                                    
-                                try:
-                                    earn_data = asyncio.run(earn_source.fetch_data(ticker))
-                                    if earn_data and not earn_data.empty:
-                                        payload['earnings'] = {'drift_direction': earn_data.iloc[0].get('drift_direction', 'Unknown')}
-                                except Exception:
-                                    pass
-                                    
-                                thesis = ai.generate_thesis(ticker, payload)
-                                
-                                st.info(thesis)
-                    st.markdown("---")
-                    # ----------------------------------
+                    _render_ai_thesis(analysis, ticker, options_data, news_data, earn_data)
                 
                 # Display tabs
                 tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs([
@@ -213,98 +726,7 @@ def render_advanced_analytics_page():
                 # Tab 1: Monte Carlo Probabilities
                 with tab1:
                     if _db2 and _uid: log_activity(_db2, _uid, "Advanced Analytics", "tab_monte_carlo", ticker=ticker)
-                    st.subheader("10,000-Path Monte Carlo Price Simulation")
-                    st.markdown("Projects future price probabilities based on stock's historical volatility and daily returns (Geometric Brownian Motion).")
-                    
-                    if analysis.history is not None and not analysis.history.empty:
-                        col1, col2 = st.columns([1, 1])
-                        
-                        with col1:
-                            days_out = st.slider("Days to Simulate", min_value=14, max_value=90, value=30, step=7)
-                        
-                        with col2:
-                            num_sims = st.selectbox("Number of Simulations", options=[1000, 5000, 10000], index=2)
-                        
-                        with st.spinner(f"Running {num_sims:,} simulations..."):
-                            mc_results = MonteCarloEngine.simulate_gbm(
-                                current_price=analysis.current_price,
-                                history=analysis.history,
-                                days_out=days_out,
-                                num_simulations=num_sims
-                            )
-                            
-                        if mc_results:
-                            
-                            mc_fig = go.Figure()
-                            
-                            # We don't want to draw 10,000 lines (too heavy for browser)
-                            # Let's draw 100 random sample paths in light grey
-                            paths = mc_results['paths']
-                            sample_indices = np.random.choice(paths.shape[1], size=min(100, paths.shape[1]), replace=False)
-                            
-                            x_axis = np.arange(days_out + 1)
-                            
-                            # Add sample lines
-                            for idx in sample_indices:
-                                mc_fig.add_trace(go.Scatter(
-                                    x=x_axis, y=paths[:, idx],
-                                    mode='lines',
-                                    line=dict(color='rgba(150, 150, 150, 0.1)', width=1),
-                                    showlegend=False,
-                                    hoverinfo='skip'
-                                ))
-                                
-                            # Calculate percentiles across all paths
-                            p5_path = np.percentile(paths, 5, axis=1)
-                            p50_path = np.percentile(paths, 50, axis=1)
-                            p95_path = np.percentile(paths, 95, axis=1)
-                            
-                            # Add Confidence Interval Cone (90% Confidence)
-                            mc_fig.add_trace(go.Scatter(
-                                x=np.concatenate([x_axis, x_axis[::-1]]),
-                                y=np.concatenate([p95_path, p5_path[::-1]]),
-                                fill='toself',
-                                fillcolor='rgba(0, 100, 250, 0.2)',
-                                line=dict(color='rgba(255,255,255,0)'),
-                                hoverinfo="skip",
-                                name="90% Confidence Interval"
-                            ))
-                            
-                            # Add Median line
-                            mc_fig.add_trace(go.Scatter(
-                                x=x_axis, y=p50_path,
-                                mode='lines',
-                                line=dict(color='rgb(50, 150, 250)', width=3, dash='dash'),
-                                name="Expected Path (Median)"
-                            ))
-                            
-                            mc_fig.update_layout(
-                                title=f"Price Projection Cone ({days_out} Days)",
-                                xaxis_title="Trading Days from Today",
-                                yaxis_title="Price ($)",
-                                height=450,
-                                showlegend=True,
-                                margin=dict(l=20, r=20, t=40, b=20)
-                            )
-                            st.plotly_chart(mc_fig, use_container_width=True)
-                            
-                            prob_up = mc_results['prob_higher'] * 100
-                            m1, m2, m3, m4 = st.columns(4)
-                            m1.metric("Current Price", f"${analysis.current_price:.2f}" if analysis.current_price else "N/A")
-                            m2.metric("Median Target (30d)", f"${p50_path[-1]:.2f}")
-                            m3.metric("Bull Target (95th %ile)", f"${p95_path[-1]:.2f}")
-                            m4.metric("Win Probability", f"{prob_up:.1f}%")
-                            
-                            # Suggested Entry/Stop - MORE PROMINENT
-                            st.markdown("---")
-                            st.success(f"🎯 **Suggested Trade Setup**")
-                            s1, s2 = st.columns(2)
-                            s1.markdown(f"👉 **Entry: ${getattr(analysis, 'suggested_entry', 0):.2f}**")
-                            s2.markdown(f"🛑 **Stop: ${getattr(analysis, 'suggested_stop_loss', 0):.2f}**")
-                            st.markdown("---")
-                            
-                    else:
-                        st.error("Missing historical price data required for simulation.")
+                    _render_monte_carlo_tab(analysis, ticker)
                         
                 # Tab 2: News Sentiment Heatmap
                 with tab2:
@@ -312,10 +734,8 @@ def render_advanced_analytics_page():
                     st.subheader("📰 Local News Sentiment Analyzer")
                     st.markdown("Scans recent headlines using Natural Language Processing (TextBlob) to detect media shifts before price reacts.")
                     
-                    with st.spinner("Analyzing recent news..."):
-                        news_data = news_source.fetch_and_analyze_news(ticker, max_articles=20)
-                        
-                    if news_data and news_data['articles']:
+                    articles = news_data['articles'] if news_data else None
+                    if articles:
                         avg_sent = news_data['average_sentiment']
                         label = news_data['sentiment_label']
                         
@@ -325,47 +745,44 @@ def render_advanced_analytics_page():
                                      f"{avg_sent*100:.1f}%" if avg_sent != 0 else None,
                                      delta_color="normal" if avg_sent > 0 else "inverse" if avg_sent < 0 else "off")
                         ncol2.metric("Overall Bias", label)
-                        ncol3.metric("Articles Analyzed", len(news_data['articles']))
+                        ncol3.metric("Articles Analyzed", len(articles))
+                        
+                        # Articles arrive newest first; reversed x positions put the newest on the right
+                        scores, labels, titles, dates = zip(*map(_NEWS_CHART_FIELDS, articles))
+                        scores = np.asarray(scores, dtype=float)
+                        colors = np.select([scores > 0.1, scores < -0.1], ['#00C851', '#ff4444'], default='#33b5e5').tolist()
+                        
+                        fig_news = go.Figure(data=[
+                            go.Bar(
+                                x=np.arange(len(articles))[::-1],
+                                y=scores,
+                                marker_color=colors,
+                                text=labels,
+                                hovertext=[f"{title}<br>{date}" for title, date in zip(titles, dates)],
+                                hoverinfo="text"
+                            )
+                        ])
+                        
+                        fig_news.update_layout(
+                            title="Recent Headline Sentiment Scores",
+                            xaxis_title="Article Flow (Oldest to Newest)",
+                            yaxis_title="NLP Polarity (-1 to 1)",
+                            xaxis=dict(showticklabels=False), # Hide indices
+                            yaxis=dict(range=[-1.1, 1.1]),
+                            height=300,
+                            margin=dict(l=20, r=20, t=40, b=20)
+                        )
+                        # Add a zero line
+                        fig_news.add_hline(y=0, line_width=1, line_color="white")
                         
-                        if news_data and 'articles' in news_data and len(news_data['articles']) > 0:
+                        st.plotly_chart(fig_news, use_container_width=True)
                         
-                            news_df = pd.DataFrame(news_data['articles'])
-                            # Reverse so newest is on the right
-                            news_df = news_df.iloc[::-1].reset_index(drop=True)
-                            
-                            colors = ['#00C851' if s > 0.1 else '#ff4444' if s < -0.1 else '#33b5e5' for s in news_df['sentiment_score']]
-                            
-                            fig_news = go.Figure(data=[
-                                go.Bar(
-                                    x=news_df.index,
-                                    y=news_df['sentiment_score'],
-                                    marker_color=colors,
-                                    text=news_df['sentiment_label'],
-                                    hovertext=news_df['title'] + '<br>' + news_df['date'],
-                                    hoverinfo="text"
-                                )
-                            ])
-                            
-                            fig_news.update_layout(
-                                title="Recent Headline Sentiment Scores",
-                                xaxis_title="Article Flow (Oldest to Newest)",
-                                yaxis_title="NLP Polarity (-1 to 1)",
-                                xaxis=dict(showticklabels=False), # Hide indices
-                                yaxis=dict(range=[-1.1, 1.1]),
-                                height=300,
-                                margin=dict(l=20, r=20, t=40, b=20)
-                            )
-                            # Add a zero line
-                            fig_news.add_hline(y=0, line_width=1, line_color="white")
-                            
-                            st.plotly_chart(fig_news, use_container_width=True)
-                            
-                            st.markdown("### Latest Headlines")
-                            for idx, row in news_df.iloc[::-1].iterrows(): # Show newest first here
-                                emoji = "🟢" if row['sentiment_label'] == "Bullish" else "🔴" if row['sentiment_label'] == "Bearish" else "⚪"
-                                st.markdown(f"**{emoji} [{row['title']}]({row['link']})**")
-                                st.caption(f"{row['publisher']} • {row['date']} • Score: {row['sentiment_score']:.3f} ")
-                                st.divider()
+                        st.markdown("### Latest Headlines")
+                        for article in articles:
+                            emoji = "🟢" if article['sentiment_label'] == "Bullish" else "🔴" if article['sentiment_label'] == "Bearish" else "⚪"
+                            st.markdown(f"**{emoji} [{article['title']}]({article['link']})**")
+                            st.caption(f"{article['publisher']} • {article['date']} • Score: {article['sentiment_score']:.3f} ")
+                            st.divider()
                     else:
                         st.warning("No recent news found to analyze.")
                         
@@ -375,9 +792,6 @@ def render_advanced_analytics_page():
                     st.subheader("📅 Post-Earnings Price Drift")
                     st.markdown("Statistically analyzes how this stock behaves on the day after (T+1) and two weeks after (T+14) earnings reports.")
                     
-                    with st.spinner("Fetching historical earnings data..."):
-                        earn_data = earn_source.fetch_earnings_drift(ticker, limit=12)
-                        
                     if earn_data and earn_data['analyzed_events'] > 0:
                         
                         ecol1, ecol2, ecol3 = st.columns(3)
@@ -393,11 +807,11 @@ def render_advanced_analytics_page():
                         edf = pd.DataFrame(earn_data['events'])
                         
                         # Add a visual emoji for Beats vs Miss
-                        def format_beat(val):
-                            if pd.isna(val): return "Unknown"
-                            return "✅ Beat" if val else "❌ Miss"
-                            
-                        edf['beat_status'] = edf['beat'].apply(format_beat)
+                        beat = edf['beat']
+                        edf['beat_status'] = np.where(
+                            beat.isna(), "Unknown",
+                            np.where(beat.astype('boolean').fillna(False), "✅ Beat", "❌ Miss")
+                        )
                         
                         # Reorder and rename columns for display
                         display_df = edf[['date', 'eps_estimate', 'eps_reported', 'beat_status', 't0_return', 't1_return', 't14_return']].copy()
@@ -424,292 +838,36 @@ def render_advanced_analytics_page():
                 # Tab 4: Options Data
                 with tab4:
                     if _db2 and _uid: log_activity(_db2, _uid, "Advanced Analytics", "tab_options", ticker=ticker)
-                    st.subheader("Options Metrics")
+                    _render_options_tab(options_data, analysis)
                     
-                    options_data = options_source.fetch_options_data(ticker)
-                    
-                    if options_data:
-                        col1, col2, col3 = st.columns(3)
-                        
-                        with col1:
-                            iv = options_data.get('implied_volatility', 0)
-                            st.metric(
-                                "Implied Volatility",
-                                f"{iv:.2%}" if iv else "N/A",
-                                help="Average IV of at-the-money options"
-                            )
-                        
-                        with col2:
-                            pcr = options_data.get('put_call_ratio', 0)
-                            st.metric(
-                                "Put/Call Ratio",
-                                f"{pcr:.2f}" if pcr else "N/A",
-                                help="Ratio of put volume to call volume"
-                            )
-                        
-                        with col3:
-                            exp = options_data.get('nearest_expiration', 'N/A')
-                            st.metric(
-                                "Nearest Expiration",
-                                exp,
-                                help="Nearest options expiration date"
-                            )
-                        
-                        st.markdown("---")
-                        
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            call_vol = options_data.get('total_call_volume', 0)
-                            st.metric("Total Call Volume", f"{call_vol:,}")
-                        with col2:
-                            put_vol = options_data.get('total_put_volume', 0)
-                            st.metric("Total Put Volume", f"{put_vol:,}")
-                        
-                        # Interpretation
-                        st.markdown("### Interpretation")
-                        if pcr > 1:
-                            st.info("📉 Put/Call Ratio > 1: More puts than calls, potentially bearish sentiment")
-                        elif pcr < 0.7:
-                            st.info("📈 Put/Call Ratio < 0.7: More calls than puts, potentially bullish sentiment")
-                        else:
-                            st.info("➡️ Put/Call Ratio neutral")
-
-                        # Options P/L Curve
-                        if analysis.suggested_entry and iv > 0:
-                            st.divider()
-                            st.subheader("🧪 Theoretical Options Strategy")
-                            st.markdown("Based on current IV and the algorithmic **Suggested Entry**.")
-                            
-                            target_price = analysis.max_buy_price if analysis.max_buy_price else (analysis.suggested_entry * 1.15)
-                            
-                            pl_data = OptionsProfitCalculator.generate_pl_curve(
-                                entry_price=analysis.suggested_entry,
-                                target_price=target_price,
-                                current_iv=iv,
-                                days_to_exp=45
-                            )
-                            
-                            st.markdown(f"**Recommended Action:** Buy 1 Call Contract at **${pl_data['suggested_strike']} Strike** expiring in ~45 Days.")
-                            # Chart the P/L
-                            pl_fig = go.Figure()
-                            # Find indices where profit > 0 to color green vs red
-                            pl_fig.add_trace(go.Scatter(
-                                x=pl_data['curve_prices'],
-                                y=pl_data['curve_profit_loss'],
-                                mode='lines',
-                                name="P/L ($)",
-                                line=dict(color='rgba(150, 150, 250, 0.8)', width=3),
-                                fill='tozeroy'
-                            ))
-                            
-                            # Add vertical line for entry
-                            pl_fig.add_vline(x=analysis.suggested_entry, line_width=2, line_dash="dash", line_color="orange", annotation_text="Entry")
-                            
-                            # Target horizontal zero line
-                            pl_fig.add_hline(y=0, line_width=1, line_color="white")
-                            
-                            pl_fig.update_layout(
-                                title="Theoretical Profit / Loss at Expiration",
-                                xaxis_title="Underlying Stock Price ($)",
-                                yaxis_title="Profit/Loss ($)",
-                                height=350,
-                                margin=dict(l=20, r=20, t=40, b=20)
-                            )
-                            st.plotly_chart(pl_fig, use_container_width=True)
-                            
-                    else:
-                        st.warning("No options data available for this ticker")
-                
                 # Tab 5: Insider Trading
                 with tab5:
                     if _db2 and _uid: log_activity(_db2, _uid, "Advanced Analytics", "tab_insider_trading", ticker=ticker)
-                    st.subheader("👔 C-Suite & Insider Trading Activity")
-                    st.markdown("Tracks the executive buy/sell flow over the last 6 months to gauge internal confidence.")
+                    _render_insider_tab(insider_data)
                     
-                    with st.spinner("Fetching SEC Form 4 equivalents..."):
-                        insider_data = insider_source.fetch_insider_activity(ticker)
-                        
-                    if insider_data and (insider_data.get('six_month_buys', 0) > 0 or insider_data.get('six_month_sales', 0) > 0 or insider_data.get('recent_transactions')):
-                        col1, col2, col3 = st.columns(3)
-                        
-                        net_shares = insider_data.get('net_shares_purchased', 0)
-                        
-                        with col1:
-                            st.metric("6-Month Insider Buys", f"{insider_data.get('six_month_buys', 0):,.0f} shares", 
-                                      help="Total shares purchased by insiders in the last 6 months")
-                            
-                        with col2:
-                            st.metric("6-Month Insider Sales", f"{insider_data.get('six_month_sales', 0):,.0f} shares",
-                                      help="Total shares sold by insiders in the last 6 months")
-                            
-                        with col3:
-                            st.metric("Net Accumulation", f"{net_shares:,.0f} shares",
-                                      delta="Accumulating" if net_shares > 0 else "Distributing" if net_shares < 0 else "Neutral",
-                                      delta_color="normal" if net_shares >= 0 else "inverse")
-                                      
-                        st.divider()
-                        
-                        if insider_data.get('recent_transactions'):
-                            st.markdown("### Most Recent Transactions")
-                            df = pd.DataFrame(insider_data['recent_transactions'])
-                            
-                            df = df[["date", "insider", "position", "transaction_type", "shares", "value"]]
-                            df.columns = ["Date", "Executive / Insider", "Position", "Transaction", "Shares", "Value ($)"]
-                            
-                            st.dataframe(df.style.format({
-                                "Shares": "{:,.0f}",
-                                "Value ($)": "${:,.0f}"
-                            }), use_container_width=True)
-                            
-                        # Interpretation
-                        st.markdown("### Interpretation")
-                        if net_shares > 0:
-                            st.success("✅ **Net Insider Buying** — Executives are actively accumulating shares, a strong bullish signal.")
-                        elif net_shares < 0:
-                            st.warning("⚠️ **Net Insider Selling** — Executives are distributing shares, which can signal caution (though often just for tax/diversification purposes).")
-                        else:
-                            st.info("➡️ **Neutral** — No significant directional insider activity recently.")
-                    else:
-                        st.warning("No recent SEC Form 4 insider trading data available for this ticker.")
-                
                 # Tab 6: Whale Tracking
                 with tab6:
                     if _db2 and _uid: log_activity(_db2, _uid, "Advanced Analytics", "tab_whale_tracking", ticker=ticker)
-                    st.subheader("Major Institutional Holders")
+                    _render_whale_tab(whale_data)
                     
-                    with st.spinner("Fetching institutional holdings..."):
-                        whale_data = whale_source.fetch_institutional_holders(ticker)
-                    
-                    if whale_data:
-                        breakdown = whale_data.get('major_holdings_breakdown', {})
-                        if breakdown:
-                            st.write("**Holdings Breakdown**")
-                            b_cols = st.columns(min(len(breakdown), 4))
-                            for i, (desc, val) in enumerate(breakdown.items()):
-                                col = b_cols[i % 4]
-                                # If it looks like a percentage string or float
-                                if isinstance(val, float):
-                                    if val < 2.0: # likely a raw decimal like 0.65
-                                        disp_val = f"{val:.2%}"
-                                    else:
-                                        disp_val = f"{val:,.0f}"
-                                else:
-                                    disp_val = str(val)
-                                col.metric(desc, disp_val)
-                            
-                        st.markdown("---")
-                        
-                        wcol1, wcol2 = st.columns(2)
-                        
-                        with wcol1:
-                            st.write("**Top Mutual Fund Holders**")
-                            mut_df = pd.DataFrame(whale_data.get("mutualfund_holders", []))
-                            if not mut_df.empty:
-                                st.dataframe(mut_df[['holder', 'shares', 'value', 'date_reported']].style.format({
-                                    'shares': '{:,}',
-                                    'value': '${:,.0f}'
-                                }), use_container_width=True)
-                            else:
-                                st.info("No mutual fund data available.")
-                                
-                        with wcol2:
-                            st.write("**Top Institutional Holders**")
-                            inst_df = pd.DataFrame(whale_data.get("institutional_holders", []))
-                            if not inst_df.empty:
-                                st.dataframe(inst_df[['holder', 'shares', 'value', 'date_reported']].style.format({
-                                    'shares': '{:,}',
-                                    'value': '${:,.0f}'
-                                }), use_container_width=True)
-                            else:
-                                st.info("No institutional data available.")
-                    else:
-                        st.warning("No institutional data available for this ticker.")
-                
                 # Tab 7: Short Interest
                 with tab7:
                     if _db2 and _uid: log_activity(_db2, _uid, "Advanced Analytics", "tab_short_interest", ticker=ticker)
-                    st.subheader("Short Interest Metrics")
-                    
-                    short_data = short_source.fetch_short_interest(ticker)
+                    _render_short_tab(short_data)
                     
-                    if short_data:
-                        col1, col2, col3 = st.columns(3)
-                        
-                        with col1:
-                            short_pct = short_data.get('short_percent_of_float', 0)
-                            st.metric(
-                                "Short % of Float",
-                                f"{short_pct:.2f}%",
-                                help="Percentage of float shares sold short"
-                            )
-                        
-                        with col2:
-                            days_to_cover = short_data.get('short_ratio', 0)
-                            st.metric(
-                                "Days to Cover",
-                                f"{days_to_cover:.2f}",
-                                help="Days to cover all short positions at average volume"
-                            )
-                        
-                        with col3:
-                            change = short_data.get('short_interest_change_pct', 0)
-                            st.metric(
-                                "Monthly Change",
-                                f"{change:+.2f}%",
-                                delta=f"{'Increasing' if change > 0 else 'Decreasing' if change < 0 else 'Flat'}",
-                                help="Change in short interest vs. prior month"
-                            )
-                        
-                        st.markdown("---")
-                        
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            shares = short_data.get('shares_short', 0)
-                            st.metric("Shares Short", f"{shares:,}")
-                        with col2:
-                            prior = short_data.get('shares_short_prior_month', 0)
-                            st.metric("Prior Month", f"{prior:,}")
-                        
-                        # Interpretation
-                        st.markdown("### Interpretation")
-                        if short_pct > 20:
-                            st.warning("⚠️ High short interest (>20%) - potential short squeeze risk")
-                        elif short_pct > 10:
-                            st.info("📊 Moderate short interest (10-20%)")
-                        else:
-                            st.success("✅ Low short interest (<10%)")
-                    else:
-                        st.warning("No short interest data available")
-                
                 # Tab 8: Candlestick Patterns
                 with tab8:
                     if _db2 and _uid: log_activity(_db2, _uid, "Advanced Analytics", "tab_patterns", ticker=ticker)
                     if analysis.history is not None and not analysis.history.empty:
-                        pattern_detector = PatternRecognition()
-                        patterns = pattern_detector.get_recent_patterns(analysis.history, days=30)
+                        history = analysis.history
+                        patterns = _cached_patterns(history, ticker, str(history.index[-1]), len(history))
                         
                         if patterns:
-                            # Build HTML table for patterns
-                            table_html = '<div style="overflow-x: auto;"><table style="width: 100%; border-collapse: collapse; margin-top: 10px; color: white; background-color: #0e1117;">'
-                            table_html += '<thead><tr style="border-bottom: 2px solid #555; text-align: left;">'
-                            table_html += '<th style="padding: 12px; width: 50px;">Icon</th>'
-                            table_html += '<th style="padding: 12px;">Date</th>'
-                            table_html += '<th style="padding: 12px;">Pattern</th>'
-                            table_html += '<th style="padding: 12px;">Signal</th>'
-                            table_html += '<th style="padding: 12px;">Price</th></tr></thead><tbody>'
-                            
-                            for p in patterns:
-                                icon_svg = render_candlestick_icon(p["pattern"])
-                                row_html = f'<tr style="border-bottom: 1px solid #444;">'
-                                row_html += f'<td style="padding: 5px;">{icon_svg}</td>'
-                                row_html += f'<td style="padding: 12px; vertical-align: middle;">{p["date"].strftime("%Y-%m-%d")}</td>'
-                                row_html += f'<td style="padding: 12px; vertical-align: middle;"><strong style="color: #64b5f6;">{p["pattern"]}</strong></td>'
-                                row_html += f'<td style="padding: 12px; vertical-align: middle;">{p["signal"]}</td>'
-                                row_html += f'<td style="padding: 12px; vertical-align: middle;">${p["price"]:.2f}</td></tr>'
-                                table_html += row_html
-                            
-                            table_html += '</tbody></table></div>'
-                            st.markdown(table_html, unsafe_allow_html=True)
+                            st.dataframe(
+                                _patterns_frame(patterns),
+                                column_config=PATTERN_COLUMN_CONFIG,
+                                hide_index=True, use_container_width=True
+                            )
                         else:
                             st.info("No significant candlestick patterns detected in the last 30 days.")
                         
@@ -729,23 +887,19 @@ def render_advanced_analytics_page():
                     if _db2 and _uid: log_activity(_db2, _uid, "Advanced Analytics", "tab_valuations", ticker=ticker)
                     st.subheader("Intrinsic Value Estimates")
                     
-                    calc = ValuationCalculator()
-                    graham = calc.calculate_graham_number(analysis)
-                    dcf = calc.calculate_dcf(analysis)
+                    price = analysis.current_price
+                    graham = ValuationCalculator.calculate_graham_number(analysis)
+                    dcf = ValuationCalculator.calculate_dcf(analysis)
+                    intrinsic = dcf.get('intrinsic_value') if dcf else None
                     
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.metric("Graham Number", f"${graham:.2f}" if graham else "N/A", help="sqrt(22.5 * EPS * Book Value)")
-                        if graham and analysis.current_price:
-                            upside = (graham / analysis.current_price) - 1
-                            st.caption(f"Upside/Downside: {upside:+.1%}")
-                            
-                    with col2:
-                        intrinsic = dcf.get('intrinsic_value') if dcf else None
-                        st.metric("DCF Intrinsic Value", f"${intrinsic:.2f}" if intrinsic else "N/A", help="5-year projected FCF with 10% discount rate")
-                        if intrinsic and analysis.current_price:
-                            upside = (intrinsic / analysis.current_price) - 1
-                            st.caption(f"Upside/Downside: {upside:+.1%}")
+                    estimates = (
+                        ("Graham Number", graham, "sqrt(22.5 * EPS * Book Value)"),
+                        ("DCF Intrinsic Value", intrinsic, "5-year projected FCF with 10% discount rate"),
+                    )
+                    for col, (label, value, help_text) in zip(st.columns(2), estimates):
+                        col.metric(label, _fmt(value, "${:.2f}"), help=help_text)
+                        if value and price:
+                            col.caption(f"Upside/Downside: {value / price - 1:+.1%}")
                     
                     st.divider()
                     
@@ -771,12 +925,13 @@ def render_advanced_analytics_page():
 
                     # Professional Export
                     st.subheader("📑 Professional Reporting")
-                    excel_data = ReportGenerator.generate_excel_report(analysis, dcf)
+                    # The workbook is only built when the button is clicked
                     st.download_button(
                         label="📥 Download Detailed Excel Analysis",
-                        data=excel_data,
+                        data=lambda: _cached_excel(analysis, dcf, analysis.ticker, analysis.current_price, str(analysis.analysis_timestamp)),
                         file_name=f"{analysis.ticker}_analysis_{datetime.now().strftime('%Y%m%d')}.xlsx",
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        on_click="ignore",
                         use_container_width=True
                     )
             else:
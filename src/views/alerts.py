@@ -7,6 +7,7 @@ from src.database import Database
 from src.alerts.alert_engine import AlertEngine
 from src.models import Alert, AlertHistory
 from sqlalchemy import desc
+from sqlalchemy.orm import joinedload
 
 
 def render_alerts_page():
@@ -90,7 +91,9 @@ def render_alerts_page():
             
             # Get all active alerts for current user
             user_id = st.session_state.get('user_id', 1)
-            alerts = session.query(Alert).filter(Alert.is_active == 1, Alert.user_id == user_id).all()
+            alerts = session.query(Alert).options(joinedload(Alert.stock)).filter(
+                Alert.is_active == 1, Alert.user_id == user_id
+            ).all()
             
             if alerts:
                 for alert in alerts:
@@ -131,27 +134,26 @@ def render_alerts_page():
         with tab3:
             st.subheader("Alert History")
             
-            # Get recent alert history
-            history = session.query(AlertHistory).order_by(
+            # Get recent alert history, loading each row's alert and stock in the same query
+            history = session.query(AlertHistory).options(
+                joinedload(AlertHistory.alert).joinedload(Alert.stock)
+            ).order_by(
                 desc(AlertHistory.triggered_at)
             ).limit(50).all()
             
             if history:
-                history_data = []
-                for h in history:
-                    alert = h.alert
-                    ticker = alert.stock.ticker if alert and alert.stock else "Unknown"
-                    
-                    history_data.append({
-                        'Time': h.triggered_at.strftime('%Y-%m-%d %H:%M:%S'),
-                        'Ticker': ticker,
-                        'Type': alert.alert_type if alert else 'N/A',
-                        'Value': f"{h.value:.2f}" if h.value else 'N/A',
-                        'Message': h.message[:50] + '...' if h.message and len(h.message) > 50 else h.message,
-                        'Notified': '✅' if h.notification_sent else '❌'
-                    })
-                
-                df = pd.DataFrame(history_data)
+                alerts = [h.alert for h in history]
+                df = pd.DataFrame({
+                    'Time': [h.triggered_at for h in history],
+                    'Ticker': [a.stock.ticker if a and a.stock else "Unknown" for a in alerts],
+                    'Type': [a.alert_type if a else 'N/A' for a in alerts],
+                    'Value': [f"{h.value:.2f}" if h.value else 'N/A' for h in history],
+                    'Message': [h.message for h in history],
+                    'Notified': ['✅' if h.notification_sent else '❌' for h in history],
+                })
+                df['Time'] = df['Time'].dt.strftime('%Y-%m-%d %H:%M:%S')
+                message = df['Message']
+                df['Message'] = message.where(message.str.len().fillna(0) <= 50, message.str[:50] + '...')
                 st.dataframe(df, width='stretch')
             else:
                 st.info("No alert history yet.")
@@ -7,6 +7,24 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from src.backtester import BacktestEngine
 
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_history(ticker: str, period: str) -> pd.DataFrame:
+    """OHLC history for a ticker, reused across parameter tweaks so only the simulation reruns"""
+    return yf.Ticker(ticker).history(period=period)
+
+
+@st.cache_data(ttl=3600, max_entries=50, show_spinner=False)
+def _cached_backtest(ticker: str, period: str, strategy: str, params: tuple, initial_capital: float) -> dict:
+    """Simulation results for one strategy setting, replayed when the same inputs come back"""
+    df = _cached_history(ticker, period)
+    if strategy == "EMA Crossover":
+        return BacktestEngine.run_ema_crossover(df, *params, initial_capital)
+    if strategy == "RSI Mean Reversion":
+        return BacktestEngine.run_rsi_strategy(df, *params, initial_capital)
+    return BacktestEngine.run_combined_strategy(df, initial_capital)
+
+
 def render_backtesting_page():
     st.title("🧪 Advanced Walk-Forward Backtester")
     st.markdown("Test technical strategies on historical data with institutional-grade metrics.")
@@ -33,8 +51,7 @@ def render_backtesting_page():
 
     if run_button and ticker:
         with st.spinner(f"Fetching {timeframe} history for {ticker}..."):
-            t = yf.Ticker(ticker)
-            df = t.history(period=timeframe)
+            df = _cached_history(ticker, timeframe)
             
         if df.empty:
             st.error(f"No data found for {ticker}")
@@ -43,11 +60,12 @@ def render_backtesting_page():
         # Run Simulation
         with st.spinner("Simulating strategy..."):
             if strategy == "EMA Crossover":
-                results = BacktestEngine.run_ema_crossover(df, short_ema, long_ema, initial_capital)
+                params = (short_ema, long_ema)
             elif strategy == "RSI Mean Reversion":
-                results = BacktestEngine.run_rsi_strategy(df, oversold, overbought, initial_capital)
+                params = (oversold, overbought)
             else:
-                results = BacktestEngine.run_combined_strategy(df, initial_capital)
+                params = ()
+            results = _cached_backtest(ticker, timeframe, strategy, params, initial_capital)
         
         # Display Results
         st.subheader(f"📊 {strategy} Results for {ticker}")
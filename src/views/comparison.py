@@ -2,9 +2,18 @@
 
 import streamlit as st
 import asyncio
-from src.analyzer import StockAnalyzer
 from src.visualization_advanced import AdvancedVisualizations
 from src.activity_logger import log_activity, log_page_visit
+from src.utils import get_cached_tickers, get_cached_analysis
+
+
+async def _analyze_all(tickers: list) -> list:
+    """Analyze every ticker concurrently; each slot holds the analysis or the exception it raised"""
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(
+        *(loop.run_in_executor(None, get_cached_analysis, ticker) for ticker in tickers),
+        return_exceptions=True
+    )
 
 
 def render_comparison_page():
@@ -18,7 +27,7 @@ def render_comparison_page():
     db = st.session_state.get('db')
     db_tickers = []
     if db:
-        db_tickers = db.get_all_tickers()
+        db_tickers = get_cached_tickers(db)
         log_page_visit(db, "Stock Comparison")
         
     with st.sidebar:
@@ -55,18 +64,15 @@ def render_comparison_page():
                          ticker=",".join(tickers))
         
         with st.spinner("Analyzing stocks..."):
-            analyzer = StockAnalyzer()
             viz = AdvancedVisualizations()
             analyses = []
             
             # Analyze all tickers
-            for ticker in tickers:
-                try:
-                    analysis = asyncio.run(analyzer.analyze(ticker))
-                    if analysis:
-                        analyses.append(analysis)
-                except Exception as e:
-                    st.error(f"Error analyzing {ticker}: {e}")
+            for ticker, result in zip(tickers, asyncio.run(_analyze_all(tickers))):
+                if isinstance(result, Exception):
+                    st.error(f"Error analyzing {ticker}: {result}")
+                else:
+                    analyses.append(result)
             
             if len(analyses) < 2:
                 st.error("Need at least 2 successful analyses to compare")
@@ -3,6 +3,7 @@ import pandas as pd
 from typing import Dict, Any, Tuple, Optional
 from src.auth import AuthManager
 from src.theme_manager import ThemeManager
+from src.utils import get_cached_tickers
 
 def render_sidebar(db) -> Tuple[str, str, bool, str]:
     """
@@ -91,7 +92,7 @@ def render_sidebar(db) -> Tuple[str, str, bool, str]:
             )
             st.session_state['show_checklist'] = show_checklist
             
-            db_tickers = db.get_all_tickers()
+            db_tickers = get_cached_tickers(db)
             default_ticker = "AAPL"
             if db_tickers:
                 selected_history = st.selectbox(
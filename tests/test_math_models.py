@@ -42,3 +42,15 @@ def test_monte_carlo_gbm(sample_history):
     assert percentiles["p5"] <= percentiles["p50"]
     assert percentiles["p50"] <= percentiles["p95"]
     assert 0 <= results["prob_higher"] <= 100
+
+def test_monte_carlo_paths_follow_daily_steps(sample_history):
+    """Each day's price is the previous day's price times that day's GBM step"""
+    results = MonteCarloEngine.simulate_gbm(150.0, sample_history, days_out=10, num_simulations=50)
+    paths = results["paths"]
+
+    assert np.all(paths[0] == 150.0)
+    assert np.array_equal(paths[-1], results["final_prices"])
+    steps = paths[1:] / paths[:-1]
+    assert np.all(steps > 0)
+    # Percentiles come from the final day's prices
+    assert results["percentiles"]["p50"] == pytest.approx(np.median(paths[-1]))
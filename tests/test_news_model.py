@@ -0,0 +1,169 @@
+"""Unit tests for News bulk upsert"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event, inspect, text
+
+from src.database import Database
+from src.models import News, Stock
+
+
+@pytest.fixture
+def session():
+    """Create in-memory database session with one stock"""
+    db = Database(":memory:")
+    db.init_db()
+    with db.get_session() as session:
+        session.add(Stock(ticker="AAPL"))
+        session.commit()
+        yield session
+
+
+def _row(stock_id, url, headline="Headline"):
+    return {"stock_id": stock_id, "url": url, "headline": headline, "sentiment_score": 0.1}
+
+
+def test_bulk_upsert_inserts_rows(session):
+    """Test that new rows are inserted"""
+    stock = session.query(Stock).first()
+    inserted = News.bulk_upsert(session, [_row(stock.id, "https://a"), _row(stock.id, "https://b")])
+    session.commit()
+    
+    assert inserted == 2
+    assert session.query(News).count() == 2
+
+
+def test_bulk_upsert_skips_duplicates(session):
+    """Test that re-seen (stock_id, url) pairs are ignored"""
+    stock = session.query(Stock).first()
+    News.bulk_upsert(session, [_row(stock.id, "https://a")])
+    inserted = News.bulk_upsert(session, [_row(stock.id, "https://a", "Updated"), _row(stock.id, "https://c")])
+    session.commit()
+    
+    assert inserted == 1
+    assert session.query(News).count() == 2
+    assert session.query(News).filter(News.url == "https://a").one().headline == "Headline"
+
+
+def test_bulk_upsert_chunks_large_batches(session, monkeypatch):
+    """Test that rows are split across multiple statements"""
+    monkeypatch.setattr(News, "BULK_CHUNK_SIZE", 3)
+    stock = session.query(Stock).first()
+    rows = [_row(stock.id, f"https://{i}") for i in range(10)]
+    
+    inserts = []
+    def count_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT"):
+            inserts.append(statement)
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", count_inserts)
+    try:
+        assert News.bulk_upsert(session, rows) == 10
+        assert News.bulk_upsert(session, []) == 0
+    finally:
+        event.remove(engine, "before_cursor_execute", count_inserts)
+    
+    # 10 rows at 3 per statement -> 3 full chunks plus a remainder
+    assert len(inserts) == 4
+
+
+def test_deleting_stock_removes_its_news(session):
+    """Test that news rows go with their stock even though SQLite doesn't enforce the FK cascade"""
+    stock = session.query(Stock).first()
+    News.bulk_upsert(session, [_row(stock.id, "https://a"), _row(stock.id, "https://b")])
+    session.commit()
+    
+    session.delete(stock)
+    session.commit()
+    
+    assert session.query(News).count() == 0
+
+
+def test_init_db_deduplicates_news_before_unique_index(tmp_path):
+    """Test that an older database with duplicate articles still gets the unique index"""
+    db = Database(str(tmp_path / "old.db"))
+    with db.engine.begin() as conn:
+        # News table as created before the (stock_id, url) constraint existed
+        conn.execute(text(
+            "CREATE TABLE news (id INTEGER PRIMARY KEY, stock_id INTEGER NOT NULL, headline TEXT NOT NULL, "
+            "url TEXT, published_date DATETIME, sentiment_score FLOAT, source VARCHAR(100), created_at DATETIME)"
+        ))
+        for url in ["https://a", "https://a", "https://b", None, None]:
+            conn.execute(text("INSERT INTO news (stock_id, headline, url) VALUES (1, 'Headline', :url)"), {"url": url})
+    
+    db.init_db()
+    
+    with db.get_session() as session:
+        assert session.query(News).filter(News.url == "https://a").count() == 1
+        assert session.query(News).filter(News.url.is_(None)).count() == 2
+    index_names = {ix['name'] for ix in inspect(db.engine).get_indexes("news")}
+    assert "uq_news_stock_url" in index_names
+    db.engine.dispose()
+
+
+def test_save_news_articles_stores_linked_headlines_once():
+    """Test that synced headlines are stored once and link-less ones are skipped"""
+    import pandas as pd
+    from src.analyzer import StockAnalysis
+    from src.utils import save_news_articles
+    
+    db = Database(":memory:")
+    db.init_db()
+    analysis = StockAnalysis(ticker="MSFT", news_articles=[
+        {"title": "Up", "publisher": "Wire", "link": "https://up",
+         "timestamp": pd.Timestamp("2026-01-02 10:00"), "sentiment_score": 0.4},
+        {"title": "Down", "publisher": "Wire", "link": "https://down",
+         "timestamp": pd.Timestamp("2026-01-02 11:00"), "sentiment_score": -0.3},
+        {"title": "No link", "publisher": "Wire", "link": "",
+         "timestamp": pd.Timestamp("2026-01-02 12:00"), "sentiment_score": 0.0},
+    ])
+    
+    assert save_news_articles(db, analysis) == 2
+    assert save_news_articles(db, analysis) == 0
+    
+    with db.get_session() as session:
+        rows = session.query(News).order_by(News.url).all()
+        assert [(r.headline, r.url, r.source) for r in rows] == [
+            ("Down", "https://down", "Wire"),
+            ("Up", "https://up", "Wire"),
+        ]
+
+
+def test_save_analysis_leaves_news_alone():
+    """Test that saving an analysis doesn't write its headlines"""
+    import pandas as pd
+    from src.analyzer import StockAnalysis
+    from src.utils import save_analysis
+    
+    db = Database(":memory:")
+    db.init_db()
+    analysis = StockAnalysis(ticker="MSFT", timestamp=pd.Timestamp("2026-01-02"), news_articles=[
+        {"title": "Up", "publisher": "Wire", "link": "https://up", "sentiment_score": 0.4},
+    ])
+    
+    save_analysis(db, analysis)
+    
+    with db.get_session() as session:
+        assert session.query(News).count() == 0
+
+
+def test_save_analysis_clears_ticker_cache_only_for_new_tickers(monkeypatch):
+    """Test that re-analyzing a known ticker keeps the history picker cache"""
+    import pandas as pd
+    from src import utils
+    from src.analyzer import StockAnalysis
+    
+    db = Database(":memory:")
+    db.init_db()
+    cleared = []
+    monkeypatch.setattr(utils, "get_cached_tickers", lambda _db: _db.get_all_tickers())
+    utils.get_cached_tickers.clear = lambda: cleared.append(True)
+    
+    utils.save_analysis(db, StockAnalysis(ticker="MSFT", timestamp=pd.Timestamp("2026-01-02")))
+    utils.save_analysis(db, StockAnalysis(ticker="MSFT", timestamp=pd.Timestamp("2026-01-03")))
+    
+    assert cleared == [True]
@@ -0,0 +1,17 @@
+"""Unit tests for the Black-Scholes options calculator"""
+
+import pytest
+from src.options_calc import OptionsProfitCalculator
+
+
+def test_pl_curve_matches_scalar_black_scholes():
+    pl = OptionsProfitCalculator.generate_pl_curve(100.0, 130.0, 0.35, days_to_exp=30)
+    
+    assert len(pl["curve_prices"]) == len(pl["curve_profit_loss"]) == 41
+    assert pl["curve_prices"][0] == pytest.approx(80.0)
+    assert pl["curve_prices"][-1] == pytest.approx(143.0)
+    for S, profit in zip(pl["curve_prices"], pl["curve_profit_loss"]):
+        expected = OptionsProfitCalculator.black_scholes(
+            S=S, K=pl["suggested_strike"], T=7.0 / 365.0, r=0.042, sigma=0.35
+        ) * 100 - pl["contract_cost"]
+        assert profit == pytest.approx(expected)
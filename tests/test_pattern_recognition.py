@@ -96,6 +96,7 @@ def test_pattern_structure(pattern_detector, sample_data):
         assert 'pattern' in pattern
         assert 'signal' in pattern
         assert 'price' in pattern
+        assert pattern['kind'] == pattern['pattern'].lower().replace(' ', '_')
 
 
 def test_empty_data(pattern_detector):
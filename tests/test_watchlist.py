@@ -114,6 +114,7 @@ def test_delete_watchlist(wm):
     
     retrieved = wm.get_watchlist(watchlist.id)
     assert retrieved is None
+    assert wm.session.query(WatchlistItem).filter(WatchlistItem.watchlist_id == watchlist.id).count() == 0
 
 
 def test_get_default_watchlist(wm):